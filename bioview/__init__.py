@@ -1,9 +1,16 @@
 # Core functionality that should always be available
+import importlib
+
 from bioview import constants as constants 
 from bioview import datatypes as datatypes
-from bioview import ui as ui
-from bioview import listeners as listeners 
-from bioview import device as device
+
+# Imported on first access, so that e.g. a headless server does not load Qt through ui
+_LAZY = ('ui', 'listeners', 'device')
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f'.{name}', __name__)
 
 __all__ = [
     'constants',
@@ -11,4 +18,4 @@ __all__ = [
     'ui',
     'listeners',
     'device'
-]
\ No newline at end of file
+]
@@ -205,10 +205,9 @@ class VisualizerClient(QMainWindow):
 
     def handle_add_source(self, source: DataSource):
         if self.plot_grid.add_source(source):
-            # Update a
+            # Update config, replaced rather than changed in place so the display worker reads it without a lock
             sel_channels = self.exp_config.get_param("display_sources")
-            sel_channels.append(source)
-            self.exp_config.set_param("display_sources", list(set(sel_channels)))
+            self.exp_config.set_param("display_sources", tuple(set(sel_channels) | {source}))
             # Change state of UI
             self.experiment_settings_panel.update_source("add", source)
 
@@ -216,8 +215,7 @@ class VisualizerClient(QMainWindow):
         if self.plot_grid.remove_source(source):
             # Update config
             sel_channels = self.exp_config.get_param("display_sources")
-            sel_channels.remove(source)
-            self.exp_config.set_param("display_sources", sel_channels)
+            self.exp_config.set_param("display_sources", tuple(s for s in sel_channels if s != source))
             # Change state of UI
             self.experiment_settings_panel.update_source("remove", source)
     
@@ -4,7 +4,7 @@ import multiprocessing
 from pathlib import Path
 from threading import Thread
 
-from PyQt6.QtCore import QMutex
+from PyQt6.QtCore import QMutex, QThreadPool, pyqtSlot
 from PyQt6.QtGui import QGuiApplication, QIcon
 from PyQt6.QtWidgets import QHBoxLayout, QMainWindow, QStatusBar, QVBoxLayout, QWidget
 
@@ -57,13 +57,14 @@ class ViewerMP(QMainWindow):
         self.resp_queue = multiprocessing.Queue()
 
         for dev_name, dev_cfg in device_config.items():
-            cmd_queue = multiprocessing.Queue()
+            # Commands only ever go from here to one backend, so a one-way pipe is enough
+            cmd_recv, cmd_send = multiprocessing.Pipe(duplex=False)
             
             process = BackendListener(
                 id=dev_name,
                 config=dev_cfg,
                 exp_config=exp_config,
-                cmd_queue=cmd_queue,
+                cmd_conn=cmd_recv,
                 resp_queue=self.resp_queue, 
                 data_queue=self.data_queue,
                 save=self.saving_status,
@@ -72,7 +73,7 @@ class ViewerMP(QMainWindow):
                 "process": process,
                 "config": dev_cfg,
                 "state": ConnectionStatus.DISCONNECTED,  # Initialize device state
-                "cmd_queue": cmd_queue,
+                "cmd_conn": cmd_send,
             }
             process.start()
 
@@ -230,7 +231,7 @@ class ViewerMP(QMainWindow):
         )
 
         for runner in self.runners.values():
-            runner["cmd_queue"].put(connect_cmd)
+            runner["cmd_conn"].send(connect_cmd)
 
     def disconnect(self):
         # Disable button during initialization
@@ -242,7 +243,7 @@ class ViewerMP(QMainWindow):
         )
 
         for runner in self.runners.values():
-            runner["cmd_queue"].put(disconnect_cmd)
+            runner["cmd_conn"].send(disconnect_cmd)
 
         self.update_buttons()
 
@@ -256,19 +257,22 @@ class ViewerMP(QMainWindow):
         )
 
         for runner in self.runners.values():
-            runner["cmd_queue"].put(start_cmd)
+            runner["cmd_conn"].send(start_cmd)
 
         # Create instruction thread
         if self.enable_instructions:
             self.instructions_thread = InstructionWorker(config=self.exp_config)
             if self.instruction_dialog is not None:
-                self.instructions_thread.textUpdate.connect(
+                self.instructions_thread.signals.textUpdate.connect(
                     self.instruction_dialog.update_instruction_text
                 )
-            self.instructions_thread.logEvent.connect(
+                self.instructions_thread.signals.toggleDialog.connect(
+                    self.instruction_dialog.toggle_ui
+                )
+            self.instructions_thread.signals.logEvent.connect(
                 self.log_display_panel.log_message
             )
-            self.instructions_thread.start()
+            QThreadPool.globalInstance().start(self.instructions_thread)
 
         # Update UI
         self.update_buttons()
@@ -283,7 +287,7 @@ class ViewerMP(QMainWindow):
         )
 
         for runner in self.runners.values():
-            runner["cmd_queue"].put(stop_cmd)
+            runner["cmd_conn"].send(stop_cmd)
 
         # Stop instruction
         if self.instructions_thread is not None:
@@ -304,6 +308,7 @@ class ViewerMP(QMainWindow):
         #         handler.sweep_frequency()
         pass 
 
+    @pyqtSlot(str, ConnectionStatus)
     def update_connection_status(self, device_name, state):
         self.runners[device_name]["state"] = state
         self.device_status_panel.update_device_state(device_name, state)
@@ -345,10 +350,9 @@ class ViewerMP(QMainWindow):
 
     def handle_add_source(self, source: DataSource):
         if self.plot_grid.add_source(source):
-            # Update a
+            # Update config, replaced rather than changed in place so the display worker reads it without a lock
             sel_channels = self.exp_config.get_param("display_sources")
-            sel_channels.append(source)
-            self.exp_config.set_param("display_sources", list(set(sel_channels)))
+            self.exp_config.set_param("display_sources", tuple(set(sel_channels) | {source}))
             # Change state of UI
             self.experiment_settings_panel.update_source("add", source)
 
@@ -356,8 +360,7 @@ class ViewerMP(QMainWindow):
         if self.plot_grid.remove_source(source):
             # Update config
             sel_channels = self.exp_config.get_param("display_sources")
-            sel_channels.remove(source)
-            self.exp_config.set_param("display_sources", sel_channels)
+            self.exp_config.set_param("display_sources", tuple(s for s in sel_channels if s != source))
             # Change state of UI
             self.experiment_settings_panel.update_source("remove", source)
 
@@ -5,7 +5,7 @@ import time
 from pathlib import Path
 
 import uhd
-from PyQt6.QtCore import QMutex
+from PyQt6.QtCore import QMutex, QThreadPool
 from PyQt6.QtGui import QGuiApplication, QIcon
 from PyQt6.QtWidgets import QHBoxLayout, QMainWindow, QStatusBar, QVBoxLayout, QWidget
 
@@ -235,13 +235,13 @@ class Viewer(QMainWindow):
         if self.enable_instructions:
             self.instructions_thread = InstructionWorker(config=self.exp_config)
             if self.instruction_dialog is not None:
-                self.instructions_thread.textUpdate.connect(
+                self.instructions_thread.signals.textUpdate.connect(
                     self.instruction_dialog.update_instruction_text
                 )
-            self.instructions_thread.logEvent.connect(
+            self.instructions_thread.signals.logEvent.connect(
                 self.log_display_panel.log_message
             )
-            self.instructions_thread.start()
+            QThreadPool.globalInstance().start(self.instructions_thread)
 
         # Update UI
         self.update_buttons()
@@ -1,10 +1,25 @@
 # Core functionality that should always be available
+import importlib
+
 from .config import Configuration
 from .datasource import DataSource
-from .device import Device
-from .experiment import ExperimentConfiguration
 from .ipc import CommandType, Message, ResponseType
-from .status import ConnectionStatus, RunningStatus
+
+# Loaded on first use, these pull in numpy and the Qt helpers from bioview.utils
+_LAZY = {
+    "Device": ".device",
+    "ExperimentConfiguration": ".experiment",
+    "RunningStatus": ".status",
+    "ConnectionStatus": ".status",
+}
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value # Later lookups skip __getattr__
+    return value
 
 __all__ = [
     "Configuration",
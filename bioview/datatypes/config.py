@@ -3,24 +3,26 @@ import importlib
 
 class Configuration:
     def __init__(self):
-        pass 
+        self._type_cache = {}  # Parameter name -> type its values are cast to
 
     def get_disp_freq(self):
         return 10  # Dummy output
 
     def set_param(self, param, value): 
-        current_type = type(getattr(self, param, None))
-        if current_type is not None:
-            setattr(self, param, current_type(value))
-        else:
-            setattr(self, param, value)
+        # Keep the type of the current value, looked up once per parameter
+        cast = self._type_cache.get(param)
+        if cast is None:
+            current_value = getattr(self, param, None)
+            if current_value is None:
+                # New or unset (None) parameters take the value as is
+                setattr(self, param, value)
+                return
+            cast = self._type_cache[param] = type(current_value)
+        # Values that already have the right type are stored as is
+        setattr(self, param, value if type(value) is cast else cast(value))
 
     def get_param(self, param, default_value=None):
-        try:
-            value = getattr(self, param)
-        except AttributeError:
-            value = default_value
-        return value
+        return getattr(self, param, default_value)
     
     def to_dict(self):
         """Convert object to dictionary for JSON serialization"""
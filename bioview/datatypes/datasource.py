@@ -4,19 +4,37 @@ class DataSource:
         self.device = device  # Keep track of device handler
         self.channel = channel
         self.label = label  # Human-readable label for the source
+        # Device names serve as IDs, so copies of a source sent between processes still match
+        self._key = (device.device_name, channel)
 
     def __eq__(self, other):
-        return self.device == other.device and self.channel == other.channel
+        if self is other:
+            return True
+        if not isinstance(other, DataSource):
+            return NotImplemented
+        return self._key == other._key
 
     def __hash__(self):
-        # Hash based on the same attributes used in __eq__
-        # Use id() for device since device objects might not be hashable
-        # Use the channel string directly since it should be hashable
-        return hash((id(self.device), self.channel))
+        # Hash based on the same key used in __eq__, not cached since string hashes differ between processes
+        return hash(self._key)
+
+    def __reduce__(self):
+        # The device holds queues and threads that cannot be pickled, so copies sent to another process keep only its name
+        return (_detached_source, (self._key, self.label))
 
     def __repr__(self):
         # String display
-        return f"{self.device.device_name}: {self.label}"
+        return f"{self._key[0]}: {self.label}"
 
     def get_disp_freq(self):
         return self.device.get_disp_freq()
+
+
+def _detached_source(key, label):
+    # Rebuilds a pickled source without its device, it still compares and hashes equal to the original
+    source = DataSource.__new__(DataSource)
+    source.device = None
+    source.channel = key[1]
+    source.label = label
+    source._key = key
+    return source
@@ -1,4 +1,5 @@
 import queue
+from collections import deque
 
 import numpy as np
 
@@ -7,7 +8,19 @@ from .datasource import DataSource
 from .status import ConnectionStatus
 from .ipc import Message, ResponseType
 
-from bioview.utils import emit_signal
+from bioview.utils import emit_signal, SharedArrayRing
+
+DISPLAY_QUEUE_LEN = 64  # Blocks kept for display, the oldest are dropped when the display falls behind
+
+# Response type for each log level, anything else is sent as debug
+_LEVEL_TO_RESP = {
+    "error": ResponseType.ERROR,
+    "warning": ResponseType.WARNING,
+    "info": ResponseType.INFO,
+    "debug": ResponseType.DEBUG,
+}
+# Severity of each log level, used to drop messages below Device.min_log_level
+_LEVEL_RANK = {"debug": 0, "info": 1, "warning": 2, "error": 3}
 
 class Device:
     def __init__(
@@ -31,6 +44,7 @@ class Device:
         self.data_queue = data_queue
         
         self.handler = None
+        self.min_log_level = "debug"  # Log events below this level are not sent, set through SET_PARAM
 
         # Configuration for saving
         self.save = save
@@ -40,28 +54,30 @@ class Device:
         else:
             self.save_queue = None
 
-        # Configuration for display
+        # Configuration for display, display is lossy so a bounded deque replaces the locked queue
         self.display = display
         if self.display:
-            self.display_queue = queue.Queue()
+            self.display_queue = deque(maxlen=DISPLAY_QUEUE_LEN)
         else:
             self.display_queue = None
 
+        # Display data is handed over through shared memory where it fits, only set up by listeners 
+        # whose consumer reads the handles back with a SharedArrayReader
+        self.display_ring = None
+
         # Keep track of all data sources
         self.data_sources: list[DataSource] = []
         # Make data sources available, depending on config
         self._populate_data_sources()
             
     def log_event(self, level, message):
-        if level == "error":
-            msg_type = ResponseType.ERROR
-        elif level == "warning":
-            msg_type = ResponseType.WARNING
-        elif level == "info":
-            msg_type = ResponseType.INFO
-        else:
-            msg_type = ResponseType.DEBUG
+        if _LEVEL_RANK.get(level, 0) < _LEVEL_RANK.get(self.min_log_level, 0):
+            return
+        # A (format, *args) tuple is only formatted once we know it is sent
+        if isinstance(message, tuple):
+            message = message[0] % message[1:]
 
+        msg_type = _LEVEL_TO_RESP.get(level, ResponseType.DEBUG)
         resp = Message(msg_type=msg_type, value=message)
         try: 
             self.resp_queue.put_nowait(resp)
@@ -76,8 +92,12 @@ class Device:
         except queue.Full: 
             print('Unable to add to response queue as it is full.')
     
+    def enable_shared_display(self):
+        self.display_ring = SharedArrayRing()
+
     def data_ready(self, data: np.ndarray, source: DataSource):
-        resp = Message(msg_type=ResponseType.DISPLAY, value=(data, source))
+        handle = None if self.display_ring is None else self.display_ring.put(data)
+        resp = Message(msg_type=ResponseType.DISPLAY, value=(data if handle is None else handle, source))
         
         try: 
             self.data_queue.put_nowait(resp)
@@ -101,13 +121,23 @@ class Device:
 
     def disconnect(self):
         self.state = ConnectionStatus.DISCONNECTED
+        
+        # The display worker writes into the ring, so it has to be done before the ring is closed
+        display_worker = getattr(self, "display_worker", None)
+        if display_worker is not None:
+            display_worker.stop()
+            if display_worker.is_alive():
+                display_worker.join()
+        if self.display_ring is not None:
+            self.display_ring.close()
     
     def update_param(self, param, value): 
-        current_type = type(getattr(self, param, None))
-        if current_type is not None:
-            setattr(self, param, current_type(value))
-        else:
+        # Same rules as Configuration.set_param
+        current_value = getattr(self, param, None)
+        if current_value is None or type(value) is type(current_value):
             setattr(self, param, value)
+        else:
+            setattr(self, param, type(current_value)(value))
         
     def update_config(self, param, value):
         self.config.set_param(param, value) 
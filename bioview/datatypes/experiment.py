@@ -27,13 +27,13 @@ class ExperimentConfiguration(Configuration):
 
         # Declare mappings
         self.channel_ifs = {}
-        self.display_sources = []  # Collection of all things to display
+        self.display_sources = ()  # Collection of all things to display, replaced whole on change
 
         ### Common functionality for instructions
         self.loop_instructions = loop_instructions
         self.instruction_type = instruction_type  # Typically audio or text
         self.instruction_file = instruction_file
-        self.instruction_interval = instruction_interval
+        self.instruction_interval = instruction_interval  # ms between text instructions
 
     def get_log_path(self):
         return get_unique_path(self.save_dir, f"{self.file_name}.log")
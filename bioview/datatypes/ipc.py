@@ -5,10 +5,12 @@ import time
 from enum import Enum 
 
 class Message:
+    __slots__ = ('msg_type', 'value', 'id')
+
     def __init__(self, msg_type, value=None, id=None):
         self.msg_type = msg_type
         self.value = value
-        self.id = id or int(time.time() * 1000)
+        self.id = id if id is not None else time.monotonic_ns() // 1_000_000
 
 class ResponseType(Enum): 
     STATUS = 'status' # Connection status 
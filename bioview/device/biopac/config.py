@@ -26,9 +26,17 @@ class BiopacConfiguration(Configuration):
     def get_samp_time(self):
         return 1000.0 / self.samp_rate
 
+    def set_param(self, param, value):
+        super().set_param(param, value)
+        if param == "channels":
+            self._padded_channels = None
+
     def get_channels(self):
         # Since the API expects 16 channels, ensure we always pad to return in the appropriate format
-        return self.channels + [0] * (16 - len(self.channels))
+        padded = getattr(self, "_padded_channels", None)
+        if padded is None:
+            padded = self._padded_channels = tuple(self.channels) + (0,) * (16 - len(self.channels))
+        return padded
 
     def get_disp_freq(self):
         return self.samp_rate
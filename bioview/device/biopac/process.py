@@ -1,4 +1,5 @@
 import queue
+from collections import deque
 from threading import Thread
 from bioview.datatypes import ExperimentConfiguration
 from bioview.utils import init_save_file, update_save_file
@@ -10,7 +11,7 @@ class ProcessWorker(Thread):
         exp_config: ExperimentConfiguration,
         bio_config: BiopacConfiguration,
         rx_queue: queue.Queue,
-        disp_queue: queue.Queue,
+        disp_queue: deque,
         running: bool = False
     ):
         super().__init__()
@@ -36,13 +37,8 @@ class ProcessWorker(Thread):
             try:
                 samples = self.rx_queue.get()
 
-                # Add to display queue
-                try:
-                    self.disp_queue.put(samples)
-                except queue.Empty:
-                    self.log_event("debug", "[BIOPAC] Display Queue Empty")
-                except queue.Full:
-                    self.log_event("debug", "[BIOPAC] Display Queue Full")
+                # Add to display queue, which drops its oldest block when full
+                self.disp_queue.append(samples)
 
                 # Save to file
                 if self.saving:
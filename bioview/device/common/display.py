@@ -1,24 +1,28 @@
-import queue
+import time
+from collections import deque
+from threading import Thread
 
 import numpy as np
-from PyQt6.QtCore import QThread, pyqtSignal
 
-from bioview.datatypes import Configuration, DataSource
-from bioview.utils import apply_filter, get_filter
+from bioview.datatypes import Configuration
+from bioview.utils import apply_filter, get_filter, emit_signal
 
+DISPLAY_POLL_INTERVAL = 0.005  # Seconds to wait when there is nothing to display
 
-class DisplayWorker(QThread):
-    dataReady = pyqtSignal(np.ndarray, DataSource)
-    logEvent = pyqtSignal(str, str)
 
+class DisplayWorker(Thread):
     def __init__(
         self,
         config: Configuration,
-        data_queue: queue.Queue,
+        data_queue: deque,
         running: bool = True,
-        parent=None,
     ):
-        super().__init__(parent)
+        super().__init__()
+        # Signals 
+        self.data_ready = None 
+        self.log_event = None 
+        
+        # Variables 
         self.config = config
         self.disp_ds = config.get_param("disp_ds", 1)
 
@@ -55,33 +59,48 @@ class DisplayWorker(QThread):
             processed, _ = apply_filter(processed, self.disp_filter)
         return processed
 
+    def _drain(self):
+        blocks = []
+        try:
+            while True:
+                blocks.append(self.data_queue.popleft())
+        except IndexError:
+            return blocks
+
     def run(self):
-        self.logEvent.emit("debug", "Display started")
+        emit_signal(self.log_event, "debug", "Display started")
 
         while self.running:
             self.display_sources = self.config.get_param("display_sources", [])
             if len(self.display_sources) == 0:
+                time.sleep(DISPLAY_POLL_INTERVAL)
                 continue
 
             try:
                 # Load samples
-                samples = self.data_queue.get()
+                samples = self.data_queue.popleft()
+            except IndexError:
+                # Nothing queued yet
+                time.sleep(DISPLAY_POLL_INTERVAL)
+                continue
+
+            # Blocks that queued up meanwhile are joined and emitted once per source
+            if self.data_queue:
+                samples = np.concatenate([samples, *self._drain()], axis=1)
 
+            try:
                 # Only process selected channels
-                for source in enumerate(self.display_sources):
+                for source in self.display_sources:
                     disp_samples = samples[source.channel, :]
                     processed = self._process(disp_samples)
 
-                    # We send data with sources
-                    self.dataReady.emit(np.array(processed), source)
-            except queue.Empty:
-                self.logEvent.emit("error", "Queue Empty")
-                continue
+                    # We send data with sources straight to the device, the array is passed by reference so no copy is needed
+                    emit_signal(self.data_ready, processed, source)
             except Exception as e:
-                self.logEvent.emit("error", f"Display error: {e}")
+                emit_signal(self.log_event, "error", f"Display error: {e}")
                 continue
 
-        self.logEvent.emit("debug", "Display stopped")
+        emit_signal(self.log_event, "debug", "Display stopped")
 
     def stop(self):
         self.running = False
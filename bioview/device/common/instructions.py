@@ -1,183 +1,273 @@
-import time
-from pathlib import Path
+import mmap
+import threading
 import os
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
-import pygame
-from PyQt6.QtCore import QMutex, QMutexLocker, QObject, QThread, pyqtSignal
+
+import numpy as np
+from PyQt6.QtCore import (
+    QObject,
+    QRunnable,
+    QTimer,
+    QUrl,
+    pyqtSignal,
+    pyqtSlot,
+)
 
 from bioview.datatypes import ExperimentConfiguration
 
 
 # Each instruction handler should be its own QObject
-class AudioPlayer(QObject):
+class InstructionHandler(QObject):
+    errored = pyqtSignal(str)
+
+    def pre_run(self):
+        # One time setup before run(), optional
+        pass
+
+    def run(self):
+        # Return True once there is nothing left for the worker to drive
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+
+class AudioPlayer(InstructionHandler):
+    _started = pyqtSignal()
+    _stopped = pyqtSignal()
+
     def __init__(self, config: ExperimentConfiguration, parent=None):
         super().__init__(parent=parent)
         self.instruction_file = config.get_param("instruction_file", None)
-        if self.instruction_file is None or not Path(self.instruction_file).exists():
+        # A single stat validates the path
+        try:
+            os.stat(self.instruction_file)
+        except (OSError, TypeError):
             raise Exception("No valid audio file found.")
 
         self.loop_instruction = config.get_param("loop_instructions", True)
-        self.mutex = QMutex()
-        self._should_stop = False
 
-        # Initialize pygame mixer
-        try:
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-        except pygame.error as e:
-            print(f"Warning: pygame mixer init issue: {e}")
+        # QtMultimedia is only loaded for audio instructions
+        from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+
+        # Decoding, looping and output all run in Qt's media backend, driven by
+        # the event loop of the thread owning this object
+        self.player = QMediaPlayer(self)
+        self.audio_output = QAudioOutput(self)
+        self.player.setAudioOutput(self.audio_output)
+        self.player.setLoops(
+            QMediaPlayer.Loops.Infinite.value
+            if self.loop_instruction
+            else QMediaPlayer.Loops.Once.value
+        )
+        self.player.setSource(QUrl.fromLocalFile(os.fspath(self.instruction_file)))
+        self.player.errorOccurred.connect(self._on_error)
+
+        # Start/stop requests from other threads are queued onto the owning thread
+        self._started.connect(self._play)
+        self._stopped.connect(self.player.stop)
 
     def pre_run(self):
-        with QMutexLocker(self.mutex):
-            self._should_stop = False  # Reset stop flag
-            try:
-                pygame.mixer.music.load(self.instruction_file)
-            except Exception as e:
-                print(f"Error loading audio file: {e}")
+        self._started.emit()
 
-    def run(self):
-        with QMutexLocker(self.mutex):
-            if self._should_stop:
-                return True
-
-            try:
-                pygame.mixer.music.play()
-            except Exception as e:
-                print(f"Error playing audio: {e}")
-                return True
-
-        # Check for completion or stop signal without holding the mutex
-        while True:
-            with QMutexLocker(self.mutex):
-                if self._should_stop:
-                    pygame.mixer.music.stop()
-                    return True
-
-                if not pygame.mixer.music.get_busy():
-                    # Audio finished naturally
-                    break
+    @pyqtSlot()
+    def _play(self):
+        self.player.setPosition(0)
+        self.player.play()
 
-            # Sleep briefly before checking again
-            self.thread().msleep(100)
+    def _on_error(self, error, message):
+        self.errored.emit(f"Error playing audio file: {message}")
 
-        # Audio completed - check if we should loop
-        return not self.loop_instruction  # True if should stop
+    def run(self):
+        # Qt plays and loops the clip, there is nothing to do on the worker thread
+        return True
 
     def stop(self):
-        with QMutexLocker(self.mutex):
-            self._should_stop = True
-            try:
-                pygame.mixer.music.stop()
-            except Exception:
-                pass
+        self._stopped.emit()
 
 
-class TextInstructions(QObject):
+class TextInstructions(InstructionHandler):
     textUpdate = pyqtSignal(str)
+    done = pyqtSignal()  # Emitted once a non-looping script has been shown
+    _started = pyqtSignal()
+    _stopped = pyqtSignal()
 
     def __init__(self, config: ExperimentConfiguration, parent=None):
         super().__init__(parent)
-        f_path = Path(config.get_param("instruction_file", ""))
+        f_path = config.get_param("instruction_file", "")
 
+        # Lines are sliced out of the page cache and decoded only when shown
+        self._mm = None
+        self.instructions = []
+        self.file_size = 0
         try:
-            self.instructions = open(f_path).read().splitlines()
+            with open(f_path, "rb") as f:
+                # Stat the open descriptor rather than the path, empty files can't be mapped
+                self.file_size = os.fstat(f.fileno()).st_size
+                if self.file_size:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mm is not None:
+                self.instructions = self._line_offsets(self._mm)
         except Exception:
-            return
+            pass
 
-        self.current_index = 0
+        # (start, end) offsets as one contiguous table, indexed modulo its length
+        self.instructions = np.asarray(self.instructions, dtype=np.int64).reshape(-1, 2)
+        self._num_lines = len(self.instructions)
+        self._decoded = [None] * self._num_lines
+        self._counter = 0
         self.loop_instruction = config.get_param("loop_instructions", True)
-        self.interval = config.get_param("instruction_interval", 5)  # seconds
-        self._should_stop = False
+        # QTimer takes whole milliseconds, convert once here
+        self.interval_ms = int(config.get_param("instruction_interval", 5000))
+        self._stop = threading.Event()
+
+        # Lines advance from the event loop of the thread owning this object,
+        # start/stop requests from other threads are queued onto it
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._advance)
+        self._started.connect(self._start_timer)
+        self._stopped.connect(self._stop_timer)
+
+    @staticmethod
+    def _line_offsets(buf):
+        offsets = []
+        start = 0
+        size = len(buf)
+        while start < size:
+            end = buf.find(b"\n", start)
+            if end == -1:
+                end = size
+            stop = end - 1 if end > start and buf[end - 1] == 0x0D else end
+            offsets.append((start, stop))
+            start = end + 1
+        return offsets
 
     def pre_run(self):
-        self._should_stop = False
+        self._stop.clear()
+        self._started.emit()
 
     def run(self):
-        # Check if we should stop
-        if self._should_stop:
-            return True
+        # The timer drives the text, there is nothing to do on the worker thread
+        return True
+
+    @pyqtSlot()
+    def _start_timer(self):
+        self._advance()
+        if self._num_lines and not self._stop.is_set():
+            self.timer.start(self.interval_ms)
+
+    @pyqtSlot()
+    def _stop_timer(self):
+        self.timer.stop()
+        if self._mm is not None and not self._mm.closed:
+            self._mm.close()
+
+    @pyqtSlot()
+    def _advance(self):
+        if self._stop.is_set():
+            return
 
         # Check if we've reached the end
-        if self.current_index >= len(self.instructions):
-            if self.loop_instruction:
-                self.current_index = 0
-            else:
-                return True  # Should stop
-
-        # Send signal to update text
-        instruction_text = self.instructions[self.current_index]
-        self.current_index += 1
-        self.textUpdate.emit(instruction_text)
+        if self._counter >= self._num_lines and (
+            not self.loop_instruction or not self._num_lines
+        ):
+            self.timer.stop()
+            self.done.emit()
+            return
 
-        # Wait for the specified interval, but check for stop periodically
-        elapsed = 0
-        sleep_increment = 0.1  # Check every 100ms
-        while elapsed < self.interval and not self._should_stop:
-            time.sleep(sleep_increment)
-            elapsed += sleep_increment
+        index = self._counter % self._num_lines
+        self._counter += 1
 
-        return self._should_stop  # Return True if we should stop
+        # Send signal to update text, each line is decoded only the first time
+        instruction_text = self._decoded[index]
+        if instruction_text is None:
+            start, end = self.instructions[index]
+            instruction_text = self._mm[start:end].decode("utf-8", errors="replace")
+            self._decoded[index] = instruction_text
+        self.textUpdate.emit(instruction_text)
 
     def stop(self):
-        self._should_stop = True
+        self._stop.set()
+        self._stopped.emit()
+
 
+INSTRUCTION_HANDLERS = {
+    "audio": AudioPlayer,
+    "text": TextInstructions,
+}
 
-class InstructionWorker(QThread):
+
+class InstructionSignals(QObject):
     logEvent = pyqtSignal(str, str)
+    # Widgets are only touched through these, queued onto the GUI thread
     textUpdate = pyqtSignal(str)  # Signal to update instruction text
-    showDialog = pyqtSignal()  # Signal to show the dialog
-    hideDialog = pyqtSignal()  # Signal to hide the dialog
+    toggleDialog = pyqtSignal(bool)  # Signal to show/hide the dialog
 
-    def __init__(
-        self, config: ExperimentConfiguration, running: bool = False, parent=None
-    ):
-        super().__init__(parent)
+
+# Runs on a pooled thread so repeated experiments reuse the same OS thread. PyQt can't
+# subclass both QObject and QRunnable, so the signals live on a separate QObject.
+class InstructionWorker(QRunnable):
+    def __init__(self, config: ExperimentConfiguration):
+        super().__init__()
+        # Python keeps ownership so stop() stays valid after run() returns
+        self.setAutoDelete(False)
         self.config = config
+        self.signals = InstructionSignals()
 
         self.instruction_type = config.get_param("instruction_type")
         self.instruction_handler = None
-        self.running = running
+        self._stop = threading.Event()
 
         try:
-            if self.instruction_type == "text":
-                self.instruction_handler = TextInstructions(config, parent=self)
-                self.instruction_handler.textUpdate.connect(self.textUpdate)
-            elif self.instruction_type == "audio":
-                self.instruction_handler = AudioPlayer(config, parent=self)
-            else:
+            handler_cls = INSTRUCTION_HANDLERS.get(self.instruction_type)
+            if handler_cls is None:
                 raise Exception(f"Invalid instruction type: {self.instruction_type}")
+            self.instruction_handler = handler_cls(config, parent=self.signals)
+            self.instruction_handler.errored.connect(self._handler_error)
+            if self.instruction_type == "text":
+                self.instruction_handler.textUpdate.connect(self.signals.textUpdate)
+                self.instruction_handler.done.connect(self._stop.set)
         except Exception as e:
-            self.logEvent.emit(
+            self.signals.logEvent.emit(
                 "error", f"Unable to initialize instruction handler: {e}"
             )
 
     def run(self):
         if self.instruction_handler is None:
-            self.logEvent.emit("warning", "No instruction handler available")
+            self.signals.logEvent.emit("warning", "No instruction handler available")
             return
 
-        self.running = True
+        # Bind handler methods once, QObject attribute lookups are not cheap
+        handler = self.instruction_handler
+        run = handler.run
+        is_stopped = self._stop.is_set
 
         # This may include file-reading, etc one time tasks before running that won't loop
-        if hasattr(self.instruction_handler, "pre_run"):
-            self.instruction_handler.pre_run()
+        handler.pre_run()
 
         if self.instruction_type == "text":
-            self.showDialog.emit()
+            self.signals.toggleDialog.emit(True)
 
-        while self.running:
-            should_stop = self.instruction_handler.run()
-            if should_stop:
-                break
+        try:
+            while not is_stopped():
+                should_stop = run()
+                if should_stop:
+                    # Nothing left to drive, sleep until the user stops
+                    self._stop.wait()
+                    break
+        except Exception as e:
+            self._handler_error(f"Instruction playback failed: {e}")
 
         self.stop()
 
+    def _handler_error(self, message):
+        self.signals.logEvent.emit("error", message)
+
     def stop(self):
-        self.running = False
+        self._stop.set()
 
         if self.instruction_handler is not None:
             self.instruction_handler.stop()
 
         # Hide text dialog
         if self.instruction_type == "text":
-            self.hideDialog.emit()
+            self.signals.toggleDialog.emit(False)
@@ -40,8 +40,17 @@ class MultiUsrpConfiguration(Configuration):
             # Copy necessary common configuration values to all devices
             self.devices[device["device_name"]].samp_rate = samp_rate
 
+    def set_param(self, param, value):
+        super().set_param(param, value)
+        # Display rate depends on these, so it is worked out again on next use
+        if param in ("samp_rate", "save_ds", "disp_ds"):
+            self._disp_freq = None
+
     def get_disp_freq(self):
-        return self.samp_rate / (self.save_ds * self.disp_ds)
+        disp_freq = getattr(self, "_disp_freq", None)
+        if disp_freq is None:
+            disp_freq = self._disp_freq = self.samp_rate / (self.save_ds * self.disp_ds)
+        return disp_freq
 
     def get_individual_configs(self):
         return self.devices.values()
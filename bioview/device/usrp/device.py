@@ -194,7 +194,7 @@ class UsrpDeviceWrapper:
         # Variables 
         self.device_name = device_name
         self.config = config
-        self.rx_queue = queue.Queue()
+        self.rx_queue = queue.SimpleQueue() # Single producer (receiver), single consumer
         
         # Connect Worker
         self.connect_worker = ConnectWorker(self.config)
@@ -1,4 +1,5 @@
 import queue
+from collections import deque
 from threading import Thread
 import numpy as np
 
@@ -14,7 +15,7 @@ class ProcessWorker(Thread):
         data_sources,
         rx_queues: list[queue.Queue],
         save_queue: queue.Queue,
-        disp_queue: queue.Queue,
+        disp_queue: deque,
         running: bool = False,
     ):
         super().__init__()
@@ -66,7 +67,7 @@ class ProcessWorker(Thread):
             # Check for significant discontinuity
             discontinuity = abs(data[0] - source.last_samples)
             if discontinuity > 3 * np.std(data[: min(100, len(data))]):
-                emit_signal(self.log_event, "debug", f"Potential discontinuity detected in {source.channel}")
+                emit_signal(self.log_event, "debug", ("Potential discontinuity detected in %s", source.channel))
 
         # Store last sample for next buffer
         if not hasattr(source, "last_samples"):
@@ -137,7 +138,7 @@ class ProcessWorker(Thread):
                 if_freq=self.channel_ifs[source.tx_idx],
             )
 
-            emit_signal(self.log_event, "debug", f"Processed channel {source.channel}")
+            emit_signal(self.log_event, "debug", ("Processed channel %s", source.channel))
 
             if self.config.get_param("save_imaginary"):
                 save_list[source.channel, :, 0] = first_comp
@@ -191,20 +192,17 @@ class ProcessWorker(Thread):
                     except queue.Full:
                         emit_signal(self.log_event, "debug", "[USRP] Save Queue Full")
 
-                # Add to display queue
-                try:
-                    # If we do not have an imaginary component, simply pass processed data
-                    if self.config.get_param("save_imaginary") is False:
-                        self.disp_queue.put(processed)
+                # Add to display queue, which drops its oldest block when full
+                # If we do not have an imaginary component, simply pass processed data
+                if self.config.get_param("save_imaginary") is False:
+                    self.disp_queue.append(processed)
+                else:
+                    # Depending on whether we want to display imaginary or not
+                    if self.config.get_param("disp_iamginary", False):
+                        self.disp_queue.append(processed[:, :, 1])
                     else:
-                        # Depending on whether we want to display imaginary or not
-                        if self.config.get_param("disp_iamginary", False):
-                            self.disp_queue.put(processed[:, :, 1])
-                        else:
-                            self.disp_queue.put(processed[:, :, 0])
-                        emit_signal(self.log_event, "debug", "[USRP] Added to display queue")
-                except queue.Full:
-                    emit_signal(self.log_event, "debug", "[USRP] Display Queue Full")
+                        self.disp_queue.append(processed[:, :, 0])
+                    emit_signal(self.log_event, "debug", "[USRP] Added to display queue")
 
             except queue.Empty:
                 emit_signal(self.log_event, "debug", "[USRP] Rx Queue Empty")
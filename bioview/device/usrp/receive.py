@@ -78,7 +78,7 @@ class ReceiveWorker(Thread):
             if curr_rx_gain != self.rx_gain:
                 for chan in self.config.rx_channels:
                     self.usrp.set_rx_gain(curr_rx_gain[chan], chan)
-                emit_signal(self.log_event, "debug", f"Rx gain updated to {curr_rx_gain}. Current {self.rx_gain}")
+                emit_signal(self.log_event, "debug", ("Rx gain updated to %s. Current %s", curr_rx_gain, self.rx_gain))
                 self.rx_gain = curr_rx_gain
 
             try:
@@ -90,7 +90,7 @@ class TransmitWorker(Thread):
             if curr_tx_gain != self.tx_gain:
                 for chan in self.config.tx_channels:
                     self.usrp.set_tx_gain(curr_tx_gain[chan], chan)
-                emit_signal(self.log_event, "debug", f"Tx gain updated to {curr_tx_gain}. Current {self.tx_gain}")
+                emit_signal(self.log_event, "debug", ("Tx gain updated to %s. Current %s", curr_tx_gain, self.tx_gain))
                 self.tx_gain = curr_tx_gain
 
             try:
@@ -1,16 +1,19 @@
 import queue
 import multiprocessing as mp
+from multiprocessing.connection import Connection
 
 from bioview.datatypes import Configuration, ExperimentConfiguration, CommandType, Message, DataSource, ResponseType, ConnectionStatus
 from bioview.device import get_device_object
 
+COMMAND_TIMEOUT = 0.1  # Seconds to block for a command before checking whether to keep running
+
 class BackendListener(mp.Process):
     def __init__(
         self,
         id: str, 
         config: Configuration, 
         exp_config: ExperimentConfiguration,
-        cmd_queue: mp.Queue, # Command passed from frontend to backend
+        cmd_conn: Connection, # Receiving end of the pipe commands are sent from frontend to backend
         resp_queue: mp.Queue, # Response passed from backend to frontend
         data_queue: mp.Queue, # Data passed from backend to frontend
         save: bool
@@ -20,7 +23,7 @@ class BackendListener(mp.Process):
         self.config = config 
         self.exp_config = exp_config
         
-        self.cmd_queue = cmd_queue  # Receives command from frontend
+        self.cmd_conn = cmd_conn  # Receives command from frontend
         self.resp_queue = resp_queue
         self.data_queue = data_queue  # Sends data from frontend to backend
         
@@ -39,32 +42,40 @@ class BackendListener(mp.Process):
             save = self.save,
             exp_config=self.exp_config
         ) 
+        # FrontendListener reads display arrays back out of shared memory
+        if self.device is not None:
+            self.device.enable_shared_display()
+        
+        # Command handlers by type, each called with the command's value. 
+        # Built here rather than in __init__ since lambdas cannot be pickled to a spawned process
+        dispatch = {
+            CommandType.CONNECT: lambda value: self.device.connect(),
+            CommandType.START: lambda value: self.device.run(),
+            CommandType.STOP: lambda value: self.device.stop(),
+            CommandType.SAVE: self._start_saving,
+            CommandType.SET_PARAM: lambda value: self.device.update_param(*value), # (param, value)
+            CommandType.DISCONNECT: lambda value: self.device.disconnect(),
+        }
         
         while self.running:
             try: 
-                # Get commands from frontend 
-                if not self.cmd_queue.empty(): 
-                    cmd = self.cmd_queue.get_nowait()
-                    if not isinstance(cmd, Message):
-                        raise TypeError(
-                            f"Expected command to be of type bioview.types.Message but got {type(cmd)} instead"
-                        )
+                # Get commands from frontend, blocking rather than spinning while idle
+                if not self.cmd_conn.poll(COMMAND_TIMEOUT):
+                    continue
+                cmd = self.cmd_conn.recv()
+                if not isinstance(cmd, Message):
+                    raise TypeError(
+                        f"Expected command to be of type bioview.types.Message but got {type(cmd)} instead"
+                    )
 
-                    # Parse commands
-                    if cmd.msg_type == CommandType.CONNECT:
-                        self.device.connect()
-                    elif cmd.msg_type == CommandType.START:
-                        self.device.run()
-                    elif cmd.msg_type == CommandType.STOP:
-                        self.device.stop()
-                    elif cmd.msg_type == CommandType.SAVE:
-                        self.device.save = True
-                        self.device.save_path = cmd.value
-                    elif cmd.msg_type == CommandType.SET_PARAM:
-                        pass  # TODO: Implement
-                    elif cmd.msg_type == CommandType.DISCONNECT:
-                        self.device.disconnect()
+                # Parse commands
+                handler = dispatch.get(cmd.msg_type)
+                if handler is not None:
+                    handler(cmd.value)
                         
+            except EOFError:
+                # Frontend has closed its end
+                break
             except Exception as e:
                 resp = Message(
                     msg_type=ResponseType.ERROR,
@@ -75,6 +86,10 @@ class BackendListener(mp.Process):
                 except queue.Full: 
                     print('Unable to add to response queue as it is full.')
 
+    def _start_saving(self, save_path):
+        self.device.save = True
+        self.device.save_path = save_path
+    
     def stop(self):
         self.running = False
         
\ No newline at end of file
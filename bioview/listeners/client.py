@@ -17,7 +17,6 @@ This can be modified for remote operation.
 '''
 
 import time 
-import json
 import struct # TODO: Remove by confirming packet structure
 import socket 
 import numpy as np
@@ -25,7 +24,7 @@ import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from bioview.datatypes import Configuration
-from .protocol import Command, Response, MAX_BUFFER_SIZE
+from .protocol import Command, Response, encode, decode, send_buffers, MAX_BUFFER_SIZE, FRAME_LENGTH, FRAME_HEADER, DTYPE_NAMES
 
 SUPPORTED_COMMANDS = [
     Command.PING,
@@ -53,13 +52,14 @@ class Client(QThread):
     # Data signals for graphical output
     data_received = pyqtSignal(np.ndarray) 
     
-    def __init__(self, address='localhost', control_port=9999, data_port=9998):
+    def __init__(self, address='localhost', control_port=9999, data_port=9998, socket_path=None):
         super().__init__()
         
         # Connection parameters
         self.address = address
         self.control_port = control_port
         self.data_port = data_port
+        self.socket_path = socket_path # Set to reach a same-host server over UNIX domain sockets
         
         # Sockets
         self.control_socket = None
@@ -73,6 +73,10 @@ class Client(QThread):
         # Data streaming
         self.streaming_active = False
         
+        # Replies are read into one buffer, grown if a reply does not fit
+        self._recv_buf = bytearray(MAX_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
+        
     def start_client(self):
         """Start the client worker"""
         self.running = True
@@ -110,30 +114,41 @@ class Client(QThread):
             if self.control_socket:
                 self.control_socket.close()
             
-            self.control_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.control_socket.settimeout(5.0)
-            self.control_socket.connect((self.address, self.control_port))
+            self.control_socket, endpoint = self._connect('control', self.control_port)
             self.control_connected = True
             
-            self.log_message.emit("debug", f"Connected to control server at {self.address}:{self.control_port}")
+            self.log_message.emit("debug", f"Connected to control server at {endpoint}")
             return True
             
         except Exception as e:
             self.log_message.emit("error", f"Failed to connect to control server: {e}")
             return False
     
+    def _connect(self, name, port):
+        """Open a socket to one of the server's endpoints, see Server.socket_path"""
+        if self.socket_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target = endpoint = f"{self.socket_path}.{name}"
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Commands are small and sent whole, Nagle would hold each one back until the previous reply
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            target, endpoint = (self.address, port), f"{self.address}:{port}"
+        
+        sock.settimeout(5.0)
+        sock.connect(target)
+        return sock, endpoint
+    
     def connect_data(self):
         """Connect to data streaming server"""
         try:
             if self.data_socket:
                 self.data_socket.close()
             
-            self.data_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.data_socket.settimeout(5.0)
-            self.data_socket.connect((self.address, self.data_port))
+            self.data_socket, endpoint = self._connect('data', self.data_port)
             self.data_connected = True
             
-            self.log_message.emit("debug", f"Connected to data server at {self.address}:{self.data_port}")
+            self.log_message.emit("debug", f"Connected to data server at {endpoint}")
             
             # Start data receiving thread
             data_thread = DataStreamer(running=self.streaming_active)
@@ -185,11 +200,11 @@ class Client(QThread):
         }
         
         try:
-            command_data = json.dumps(command).encode('utf-8')
-            self.control_socket.send(command_data)
+            # Length-prefixed, so the server replies the same way, see protocol.py
+            command_data = encode(command)
+            send_buffers(self.control_socket, FRAME_LENGTH.pack(len(command_data)), command_data)
             
-            response_data = self.control_socket.recv(MAX_BUFFER_SIZE)
-            response = json.loads(response_data.decode('utf-8'))
+            response = decode(self._recv_frame())
             
             return response
             
@@ -198,6 +213,25 @@ class Client(QThread):
             self.disconnect_from_server()
             return None
     
+    def _recv_frame(self):
+        """Read one length-prefixed reply from the control socket"""
+        self._recv_exactly(self._recv_view[:FRAME_LENGTH.size])
+        (length,) = FRAME_LENGTH.unpack_from(self._recv_buf)
+        if length > len(self._recv_buf):
+            self._recv_buf = bytearray(length)
+            self._recv_view = memoryview(self._recv_buf)
+        
+        self._recv_exactly(self._recv_view[:length])
+        return self._recv_buf[:length]
+    
+    def _recv_exactly(self, view):
+        """Fill view from the control socket"""
+        while view:
+            num_bytes = self.control_socket.recv_into(view)
+            if not num_bytes:
+                raise ConnectionError("Control connection closed by server")
+            view = view[num_bytes:]
+    
     def ping_server(self):
         """Test server connectivity"""
         response = self.send_control_command(Command.PING)
@@ -376,19 +410,15 @@ class DataStreamer(QThread):
     def _deserialize_data(self, data_bytes):
         """Deserialize numpy data from server"""
         try:
-            # Read header length
-            header_length = struct.unpack('!I', data_bytes[:4])[0]
-            
-            # Read header
-            header_bytes = data_bytes[4:4+header_length]
-            header = json.loads(header_bytes.decode('utf-8'))
+            # Read fixed size header, see protocol.py for the format
+            dtype_code, ndim, dim0, dim1, _, num_bytes = FRAME_HEADER.unpack_from(data_bytes)
             
             # Read data
-            array_bytes = data_bytes[4+header_length:]
+            array_bytes = data_bytes[FRAME_HEADER.size:FRAME_HEADER.size + num_bytes]
             
             # Reconstruct numpy array
-            shape = tuple(header['shape'])
-            dtype = np.dtype(header['dtype'])
+            shape = (dim0, dim1)[:ndim]
+            dtype = np.dtype(DTYPE_NAMES[dtype_code])
             
             data = np.frombuffer(array_bytes, dtype=dtype).reshape(shape)
             
@@ -5,11 +5,12 @@ Use this to test UHD functionality step by step
 """
 
 import socket
-import json
 import time
 
 from enum import Enum
 
+from bioview.listeners.protocol import encode, decode
+
 class CommandType(Enum):
     PING = "ping"
     DISCOVER_DEVICES = "discover_devices"
@@ -30,6 +31,7 @@ class UHDClient:
         """Connect to UHD server"""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.socket.connect((self.host, self.port))
             self.connected = True
             print(f"✓ Connected to UHD server at {self.host}:{self.port}")
@@ -57,12 +59,10 @@ class UHDClient:
         
         try:
             # Send command
-            command_data = json.dumps(command).encode('utf-8')
-            self.socket.send(command_data)
+            self.socket.send(encode(command))
             
             # Receive response
-            response_data = self.socket.recv(4096)
-            response = json.loads(response_data.decode('utf-8'))
+            response = decode(self.socket.recv(4096))
             
             return response
             
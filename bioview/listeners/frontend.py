@@ -4,6 +4,15 @@ import multiprocessing as mp
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from bioview.datatypes import DataSource, ConnectionStatus, Message, ResponseType
+from bioview.utils import SharedArrayReader
+
+# Log level for each logging response type
+_RESP_TO_LEVEL = {
+    ResponseType.ERROR: "error",
+    ResponseType.WARNING: "warning",
+    ResponseType.INFO: "info",
+    ResponseType.DEBUG: "debug",
+}
 
 class FrontendListener(QObject):
     logEvent = pyqtSignal(str, str)  # (Level, Message)
@@ -15,6 +24,7 @@ class FrontendListener(QObject):
         super().__init__(parent)
         self.data_queue = data_queue
         self.resp_queue = resp_queue
+        self.shared_reader = SharedArrayReader()
 
     def start(self):
         self.running = True
@@ -25,14 +35,9 @@ class FrontendListener(QObject):
                 if not self.resp_queue.empty(): 
                     resp = self.resp_queue.get_nowait()
 
-                    if resp.msg_type == ResponseType.ERROR:
-                        self.logEvent.emit("error", resp.value)
-                    elif resp.msg_type == ResponseType.WARNING:
-                        self.logEvent.emit("warning", resp.value)
-                    elif resp.msg_type == ResponseType.INFO:
-                        self.logEvent.emit("info", resp.value)
-                    elif resp.msg_type == ResponseType.DEBUG:
-                        self.logEvent.emit("debug", resp.value)
+                    level = _RESP_TO_LEVEL.get(resp.msg_type)
+                    if level is not None:
+                        self.logEvent.emit(level, resp.value)
                     elif resp.msg_type == ResponseType.STATUS:
                         self.connectionStateChanged.emit(resp.value[0], resp.value[1])
                 
@@ -40,9 +45,15 @@ class FrontendListener(QObject):
                 if not self.data_queue.empty():
                     resp = self.data_queue.get_nowait()
                     if resp.msg_type == ResponseType.DISPLAY:
-                        self.dataReady.emit("error", resp.value[0], resp.value[1])
+                        data, source = resp.value
+                        if isinstance(data, tuple):
+                            # Handle to an array in shared memory
+                            data = self.shared_reader.read(data)
+                        self.dataReady.emit(data, source)
             except Exception:
                 time.sleep(0.001)
 
+        self.shared_reader.close()
+
     def stop(self):
         self.running = False
\ No newline at end of file
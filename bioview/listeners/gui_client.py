@@ -5,6 +5,12 @@ This replicates your bioview UI architecture with the working server-client mode
 """
 
 import sys
+import codecs
+import collections
+import functools
+import itertools
+import queue
+import selectors
 import socket
 import json
 import time
@@ -15,12 +21,12 @@ from typing import Optional, Dict, Any
 try:
     from PyQt6.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-        QPushButton, QTextEdit, QLabel, QStatusBar, QGroupBox, QSpinBox,
-        QDoubleSpinBox, QComboBox, QLineEdit, QFormLayout, QTabWidget,
+        QPushButton, QTextEdit, QPlainTextEdit, QLabel, QStatusBar, QGroupBox, 
+        QSpinBox, QDoubleSpinBox, QComboBox, QLineEdit, QFormLayout, QTabWidget,
         QProgressBar, QSplitter
     )
     from PyQt6.QtCore import QThread, pyqtSignal, QTimer, Qt
-    from PyQt6.QtGui import QFont, QTextCursor
+    from PyQt6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextCursor
 except ImportError:
     print("PyQt6 not found. Please install: pip install PyQt6")
     sys.exit(1)
@@ -39,18 +45,48 @@ class CommandType(Enum):
     CONFIGURE_DEVICE = "configure_device"
     SHUTDOWN = "shutdown"
 
+# Commands without parameters always serialize to the same bytes, so encode them once
+_STATIC_COMMANDS = {
+    command_type: json.dumps({'type': command_type.value, 'params': {}}).encode('utf-8')
+    for command_type in (
+        CommandType.PING,
+        CommandType.DISCOVER_DEVICES,
+        CommandType.DISCONNECT_DEVICE,
+        CommandType.GET_STATUS,
+        CommandType.SHUTDOWN,
+    )
+}
+
+# Preferred keys for building device args from discovery results
+_ARG_KEYS = (('serial', 'serial={}'), ('addr', 'addr={}'))
+
+@functools.lru_cache(maxsize=32)
+def _encode_connect_command(device_args):
+    """Reconnecting to the same device reuses its serialized request"""
+    command = {
+        'type': CommandType.CONNECT_DEVICE.value,
+        'params': {'device_args': device_args}
+    }
+    return json.dumps(command).encode('utf-8')
+
 class UHDClientWorker(QThread):
-    """Qt thread that manages communication with UHD server"""
+    """Qt thread that manages communication with UHD server
+    
+    Commands are queued by the GUI and written out by the worker thread without waiting
+    for earlier replies. The server answers each connection in order, so replies are 
+    matched to the oldest outstanding request.
+    """
     
     # Signals for GUI communication
     server_connected = pyqtSignal()
     server_disconnected = pyqtSignal()
+    ping_completed = pyqtSignal(bool)
     device_discovered = pyqtSignal(list)  # List of devices
     device_connected = pyqtSignal(dict)   # Device info
     device_disconnected = pyqtSignal()
     configuration_updated = pyqtSignal(dict)
     error_occurred = pyqtSignal(str)
-    log_message = pyqtSignal(str, str)    # level, message
+    log_message = pyqtSignal(list)        # [(level, message), ...]
     
     def __init__(self, host='localhost', port=9999):
         super().__init__()
@@ -60,6 +96,24 @@ class UHDClientWorker(QThread):
         self.connected = False
         self.running = False
         
+        # Pipelined requests
+        self._tx_q = queue.Queue()    # (req_id, command bytes, callback) from the GUI
+        self._pending = {}            # req_id -> callback, in send order
+        self._req_ids = itertools.count()
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._rx_buf = ''
+        self._tx_buf = bytearray()
+        self._log_buf = collections.deque()  # Flushed as one log_message per loop
+        self._want_write = False
+        
+        # Non-blocking I/O is multiplexed with a wakeup pair so the GUI can interrupt select()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        
     def start_client(self):
         """Start the client worker"""
         self.running = True
@@ -68,24 +122,55 @@ class UHDClientWorker(QThread):
     def stop_client(self):
         """Stop the client worker"""
         self.running = False
-        self.disconnect_from_server()
+        self._wake()
         self.quit()
         self.wait()
+        self.disconnect_from_server()
+        self._flush_logs()
         
     def run(self):
-        """Main worker thread - maintains server connection"""
-        self.log_message.emit("info", "Client worker started")
+        """Main worker thread - maintains server connection and services requests"""
+        self._log("info", "Client worker started")
         
         while self.running:
+            self._flush_logs()
+            
             if not self.connected:
                 if self.connect_to_server():
                     self.server_connected.emit()
                 else:
-                    time.sleep(2)  # Retry connection
+                    self._flush_logs()
+                    
+                    # Retry connection, unless woken up to stop
+                    if self._selector.select(timeout=2):
+                        self._drain_wakeups()
                     continue
             
-            time.sleep(0.1)  # Main loop delay
+            try:
+                self._flush_requests()
+                for key, events in self._selector.select(timeout=0.25):
+                    if key.fileobj is self._wake_r:
+                        self._drain_wakeups()
+                        continue
+                    if events & selectors.EVENT_WRITE:
+                        self._write_pending()
+                    if events & selectors.EVENT_READ:
+                        self._read_responses()
+            except Exception as e:
+                self.error_occurred.emit(f"Communication error: {e}")
+                self.disconnect_from_server()
             
+    def _log(self, level, message):
+        self._log_buf.append((level, message))
+    
+    def _flush_logs(self):
+        """Emit all buffered log messages in a single cross-thread signal"""
+        batch = []
+        while self._log_buf:
+            batch.append(self._log_buf.popleft())
+        if batch:
+            self.log_message.emit(batch)
+    
     def connect_to_server(self):
         """Connect to UHD server"""
         try:
@@ -93,20 +178,36 @@ class UHDClientWorker(QThread):
                 self.socket.close()
                 
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Commands are small, send them at once
             self.socket.settimeout(5.0)  # 5 second timeout
             self.socket.connect((self.host, self.port))
+            self.socket.setblocking(False)
+            self._selector.register(self.socket, selectors.EVENT_READ)
+            self._want_write = False
+            self._utf8.reset()
+            self._rx_buf = ''
+            self._tx_buf.clear()
             self.connected = True
             
-            self.log_message.emit("info", f"Connected to UHD server at {self.host}:{self.port}")
+            self._log("info", f"Connected to UHD server at {self.host}:{self.port}")
             return True
             
         except Exception as e:
-            self.log_message.emit("error", f"Failed to connect to server: {e}")
+            self._log("error", f"Failed to connect to server: {e}")
             return False
     
     def disconnect_from_server(self):
         """Disconnect from server"""
         if self.socket:
+            try:
+                self._selector.unregister(self.socket)
+            except (KeyError, ValueError):
+                pass
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Peer already gone
             try:
                 self.socket.close()
             except:
@@ -116,76 +217,154 @@ class UHDClientWorker(QThread):
         if self.connected:
             self.connected = False
             self.server_disconnected.emit()
-            self.log_message.emit("info", "Disconnected from UHD server")
+            self._log("info", "Disconnected from UHD server")
+        
+        # Outstanding requests will never be answered
+        pending, self._pending = self._pending, {}
+        for callback in pending.values():
+            if callback is not None:
+                callback(None)
+    
+    def send_command(self, command_type, params=None, callback=None):
+        """Queue command for the server, callback receives the response (None on failure)"""
+        command_data = _STATIC_COMMANDS.get(command_type) if params is None else None
+        if command_data is None:
+            command = {
+                'type': command_type.value,
+                'params': params or {}
+            }
+            command_data = json.dumps(command).encode('utf-8')
+        
+        return self._submit(command_data, callback)
     
-    def send_command(self, command_type, params=None):
-        """Send command to server"""
+    def _submit(self, command_data, callback):
+        """Queue serialized command for the worker thread"""
         if not self.connected:
             self.error_occurred.emit("Not connected to server")
             return None
         
-        command = {
-            'type': command_type.value,
-            'params': params or {}
-        }
-        
+        req_id = next(self._req_ids)
+        self._tx_q.put((req_id, command_data, callback))
+        self._wake()
+        return req_id
+    
+    def _wake(self):
+        """Interrupt the worker's select() call"""
         try:
-            # Send command
-            command_data = json.dumps(command).encode('utf-8')
-            self.socket.send(command_data)
-            
-            # Receive response
-            response_data = self.socket.recv(4096)
-            response = json.loads(response_data.decode('utf-8'))
-            
-            return response
+            self._wake_w.send(b'\0')
+        except BlockingIOError:
+            pass  # Worker already has a wakeup pending
+    
+    def _drain_wakeups(self):
+        try:
+            while self._wake_r.recv(64):
+                pass
+        except BlockingIOError:
+            pass
+    
+    def _flush_requests(self):
+        """Write out every queued command without waiting for replies"""
+        queued = False
+        while True:
+            try:
+                req_id, command_data, callback = self._tx_q.get_nowait()
+            except queue.Empty:
+                break
+            self._pending[req_id] = callback
+            self._tx_buf += command_data
+            queued = True
+        
+        if queued:
+            self._write_pending()
+    
+    def _write_pending(self):
+        """Send as much buffered data as the socket accepts, wait for writability otherwise"""
+        try:
+            sent = self.socket.send(self._tx_buf)
+        except BlockingIOError:
+            sent = 0
+        del self._tx_buf[:sent]
+        
+        want_write = bool(self._tx_buf)
+        if want_write != self._want_write:
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+            self._selector.modify(self.socket, events)
+            self._want_write = want_write
+    
+    def _read_responses(self):
+        """Consume available replies and dispatch them to their requests"""
+        while True:
+            try:
+                data = self.socket.recv(4096)
+            except BlockingIOError:
+                break
+            if not data:
+                raise ConnectionError("Server closed connection")
+            self._rx_buf += self._utf8.decode(data)
+        
+        while self._rx_buf:
+            try:
+                response, end = self._decoder.raw_decode(self._rx_buf)
+            except json.JSONDecodeError:
+                break  # Partial reply, wait for the rest
+            self._rx_buf = self._rx_buf[end:].lstrip()
             
-        except Exception as e:
-            self.error_occurred.emit(f"Communication error: {e}")
-            self.disconnect_from_server()
-            return None
+            if not self._pending:
+                continue  # Unsolicited reply
+            req_id = next(iter(self._pending))
+            callback = self._pending.pop(req_id)
+            if callback is not None:
+                callback(response)
     
     def ping_server(self):
         """Test server connectivity"""
-        self.log_message.emit("debug", "Pinging server...")
-        response = self.send_command(CommandType.PING)
-        
+        self._log("debug", "Pinging server...")
+        self.send_command(CommandType.PING, callback=self._on_ping_response)
+    
+    def _on_ping_response(self, response):
         if response and response.get('type') == 'success':
-            self.log_message.emit("info", "Server ping successful")
-            return True
+            self._log("info", "Server ping successful")
+            self.ping_completed.emit(True)
         else:
-            self.log_message.emit("error", "Server ping failed")
-            return False
+            self._log("error", "Server ping failed")
+            self.ping_completed.emit(False)
     
     def discover_devices(self):
         """Discover USRP devices"""
-        self.log_message.emit("info", "Starting device discovery...")
-        response = self.send_command(CommandType.DISCOVER_DEVICES)
-        
+        self._log("info", "Starting device discovery...")
+        self.send_command(CommandType.DISCOVER_DEVICES, callback=self._on_discover_response)
+    
+    def _on_discover_response(self, response, retried=False):
         if response:
             if response.get('type') == 'success':
                 step = response.get('step', 'unknown')
                 if step == 'discovery':
                     devices = response.get('devices', [])
-                    self.log_message.emit("info", f"Found {len(devices)} devices")
+                    self._log("info", f"Found {len(devices)} devices")
                     self.device_discovered.emit(devices)
+                elif not retried:
+                    # Server only imported UHD, discover again without user intervention
+                    self._log("debug", "UHD imported, repeating discovery")
+                    self.send_command(
+                        CommandType.DISCOVER_DEVICES, 
+                        callback=lambda response: self._on_discover_response(response, retried=True)
+                    )
                 else:
-                    self.log_message.emit("info", "UHD imported, run discovery again")
+                    self._log("info", "UHD imported, run discovery again")
             else:
                 error_msg = response.get('message', 'Unknown error')
                 self.error_occurred.emit(f"Device discovery failed: {error_msg}")
     
     def connect_to_device(self, device_args):
         """Connect to specific device"""
-        self.log_message.emit("info", f"Connecting to device: {device_args}")
-        response = self.send_command(CommandType.CONNECT_DEVICE, {
-            'device_args': device_args
-        })
-        
+        self._log("info", f"Connecting to device: {device_args}")
+        self._submit(_encode_connect_command(device_args), self._on_connect_response)
+    
+    def _on_connect_response(self, response):
         if response:
             if response.get('type') == 'success':
                 device_info = response.get('device_info', {})
-                self.log_message.emit("info", "Device connected successfully")
+                self._log("info", "Device connected successfully")
                 self.device_connected.emit(device_info)
             else:
                 error_msg = response.get('message', 'Unknown error')
@@ -193,21 +372,26 @@ class UHDClientWorker(QThread):
     
     def disconnect_device(self):
         """Disconnect from device"""
-        self.log_message.emit("info", "Disconnecting device...")
-        response = self.send_command(CommandType.DISCONNECT_DEVICE)
-        
+        self._log("info", "Disconnecting device...")
+        self.send_command(CommandType.DISCONNECT_DEVICE, callback=self._on_disconnect_response)
+    
+    def _on_disconnect_response(self, response):
         if response and response.get('type') == 'success':
-            self.log_message.emit("info", "Device disconnected")
+            self._log("info", "Device disconnected")
             self.device_disconnected.emit()
     
     def configure_device(self, config):
         """Configure device parameters"""
-        self.log_message.emit("info", "Configuring device...")
-        response = self.send_command(CommandType.CONFIGURE_DEVICE, config)
-        
+        self._log("info", "Configuring device...")
+        self.send_command(
+            CommandType.CONFIGURE_DEVICE, config, 
+            callback=lambda response: self._on_configure_response(response, config)
+        )
+    
+    def _on_configure_response(self, response, config):
         if response:
             if response.get('type') == 'success':
-                self.log_message.emit("info", "Device configured successfully")
+                self._log("info", "Device configured successfully")
                 self.configuration_updated.emit(config)
             else:
                 error_msg = response.get('message', 'Unknown error')
@@ -305,6 +489,7 @@ class DeviceControlPanel(QWidget):
         self.device_info_text = QTextEdit()
         self.device_info_text.setMaximumHeight(100)
         self.device_info_text.setReadOnly(True)
+        self.device_info_text.document().setMaximumBlockCount(16)  # Always overwritten
         info_layout.addWidget(self.device_info_text)
         
         layout.addWidget(info_group)
@@ -314,32 +499,36 @@ class DeviceControlPanel(QWidget):
     def update_discovered_devices(self, devices):
         """Update device list from discovery"""
         self.devices = devices
+        self.device_combo.blockSignals(True)
         self.device_combo.clear()
         
         if devices:
+            labels = [
+                f"{device.get('type', 'Unknown')} (S/N: {device.get('serial', 'No Serial')})"
+                for device in devices
+            ]
+            self.device_combo.addItems(labels)
             for i, device in enumerate(devices):
-                device_type = device.get('type', 'Unknown')
-                serial = device.get('serial', 'No Serial')
-                display_text = f"{device_type} (S/N: {serial})"
-                self.device_combo.addItem(display_text, device)
+                self.device_combo.setItemData(i, device)
             
             self.connect_btn.setEnabled(True)
         else:
             self.device_combo.addItem("No devices found")
             self.connect_btn.setEnabled(False)
+        
+        self.device_combo.blockSignals(False)
     
     def on_connect_clicked(self):
         """Handle connect button click"""
         current_data = self.device_combo.currentData()
         if current_data:
             # Build device args string
-            device_args = ""
-            if 'serial' in current_data:
-                device_args = f"serial={current_data['serial']}"
-            elif 'addr' in current_data:
-                device_args = f"addr={current_data['addr']}"
+            for key, fmt in _ARG_KEYS:
+                if key in current_data:
+                    self.connect_requested.emit(fmt.format(current_data[key]))
+                    return
             
-            self.connect_requested.emit(device_args)
+            self.connect_requested.emit("")
     
     def on_configure_clicked(self):
         """Handle configure button click"""
@@ -372,11 +561,43 @@ class DeviceControlPanel(QWidget):
         self.configure_btn.setEnabled(False)
         self.device_info_text.clear()
 
+# Color coding
+LOG_COLORS = {
+    'error': 'red',
+    'warning': 'orange',
+    'info': 'blue',
+    'debug': 'gray'
+}
+
+class LogHighlighter(QSyntaxHighlighter):
+    """Colors plain "[hh:mm:ss] LEVEL: message" log lines by their level"""
+    
+    def __init__(self, document):
+        super().__init__(document)
+        self._formats = {}
+        for level, color in LOG_COLORS.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self._formats[level.upper()] = fmt
+    
+    def highlightBlock(self, text):
+        # Level sits between the 11 character timestamp prefix and the next colon
+        fmt = self._formats.get(text[11:text.find(':', 11)])
+        if fmt is not None:
+            self.setFormat(0, len(text), fmt)
+
 class LogDisplayPanel(QWidget):
     """Log display panel - similar to your log panel"""
     
     def __init__(self):
         super().__init__()
+        
+        # Timestamps only change once a second, so reuse the last formatted one
+        self._last_sec = -1
+        self._last_ts = ""
+        
+        self._label = {level: level.upper() for level in LOG_COLORS}
+        
         self.init_ui()
         
     def init_ui(self):
@@ -388,9 +609,11 @@ class LogDisplayPanel(QWidget):
         layout.addWidget(title_label)
         
         # Log display
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setFont(QFont("Consolas", 9))
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(5000)  # Oldest lines are evicted
+        self.log_highlighter = LogHighlighter(self.log_text.document())
         layout.addWidget(self.log_text)
         
         # Clear button
@@ -398,25 +621,23 @@ class LogDisplayPanel(QWidget):
         clear_btn.clicked.connect(self.log_text.clear)
         layout.addWidget(clear_btn)
     
+    def add_log_messages(self, messages):
+        """Add a batch of (level, message) entries"""
+        for level, message in messages:
+            self.add_log_message(level, message)
+    
     def add_log_message(self, level, message):
         """Add log message with timestamp"""
-        timestamp = time.strftime("%H:%M:%S")
-        
-        # Color coding
-        color_map = {
-            'error': 'red',
-            'warning': 'orange',
-            'info': 'blue',
-            'debug': 'gray'
-        }
-        
-        color = color_map.get(level.lower(), 'black')
+        sec = int(time.time())
+        if sec != self._last_sec:
+            self._last_sec = sec
+            self._last_ts = time.strftime("%H:%M:%S", time.localtime(sec))
+        timestamp = self._last_ts
         
-        # Format message
-        formatted_msg = f'<span style="color: {color};">[{timestamp}] {level.upper()}: {message}</span>'
+        label = self._label.get(level) or level.upper()
         
-        # Add to log
-        self.log_text.append(formatted_msg)
+        # Add to log, coloring is left to the highlighter
+        self.log_text.appendPlainText(f"[{timestamp}] {label}: {message}")
         
         # Auto-scroll to bottom
         cursor = self.log_text.textCursor()
@@ -517,7 +738,7 @@ class UHDMainWindow(QMainWindow):
         self.uhd_client.device_connected.connect(self.device_panel.on_device_connected)
         self.uhd_client.device_disconnected.connect(self.device_panel.on_device_disconnected)
         self.uhd_client.error_occurred.connect(self.on_error)
-        self.uhd_client.log_message.connect(self.log_panel.add_log_message)
+        self.uhd_client.log_message.connect(self.log_panel.add_log_messages)
         
         # Start client
         self.uhd_client.start_client()
@@ -4,6 +4,9 @@ Streaming UHD Server - Handles UHD operations with real-time data streaming
 Integrates your existing USRP backend (ProcessWorker, ReceiveWorker, etc.) with server-client model
 """
 
+import functools
+import logging
+import selectors
 import socket
 import json
 import time
@@ -12,32 +15,41 @@ import sys
 import threading
 import traceback
 import queue
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 import numpy as np
-import struct
 from enum import Enum
-import uhd 
-from bioview.device import discover_devices
 
-print(sys.modules.keys())
+_UHD_DLL_PATHS = (
+    r"C:\Program Files\UHD\bin",
+    r"C:\Program Files (x86)\UHD\bin", 
+    r"C:\local\uhd\bin",
+)
 
-# Windows DLL setup
-if sys.platform == "win32":
-    print("Setting up Windows DLL paths...")
-    uhd_paths = [
-        r"C:\Program Files\UHD\bin",
-        r"C:\Program Files (x86)\UHD\bin", 
-        r"C:\local\uhd\bin"
-    ]
-    
-    for path in uhd_paths:
-        if os.path.exists(path):
+@functools.cache
+def _setup_uhd_dll():
+    """On Windows, make the UHD DLLs loadable, this must run before uhd is imported"""
+    if sys.platform != "win32":
+        return
+    
+    # Extension modules no longer search PATH for their DLLs, but the UHD installer usually puts its 
+    # bin directory there, which saves probing the usual install locations
+    on_path = [path for path in os.environ.get('PATH', '').split(os.pathsep) if 'uhd' in path.lower()]
+    
+    for path in on_path or _UHD_DLL_PATHS:
+        if os.path.isdir(path):
             try:
                 os.add_dll_directory(path)
-                print(f"✓ Added UHD DLL path: {path}")
-                break
-            except Exception as e:
+                return
+            except OSError as e:
                 print(f"✗ Failed to add DLL path {path}: {e}")
 
+_setup_uhd_dll()
+
+import uhd 
+from bioview.device import discover_devices
+from bioview.listeners.protocol import encode, decode, DecodeError, send_buffers, split_framed, split_commands, is_packed, pack, DEBUG, FRAME_LENGTH, FRAME_HEADER, DTYPE_CODES, MAX_BUFFER_SIZE
+
 class CommandType(Enum):
     PING = "ping"
     DISCOVER_DEVICES = "discover_device"
@@ -49,12 +61,42 @@ class CommandType(Enum):
     GET_STATUS = "get_status"
     SHUTDOWN = "shutdown"
 
+_ALL_COMMANDS = tuple(cmd.value for cmd in CommandType)
+
+# Answered straight from the I/O loop, everything else may wait on the device and runs on the device worker
+_INLINE_COMMANDS = frozenset((CommandType.PING.value, CommandType.GET_STATUS.value))
+
+# Messages from the streaming thread, written out by a listener thread so logging never blocks a send
+logger = logging.getLogger('bioview.stream')
+
 class ResponseType(Enum):
     SUCCESS = "success"
     ERROR = "error"
     INFO = "info"
     STREAM_DATA = "stream_data"
 
+# Fixed-shape responses, only their fields are filled in per request
+_JSON_BOOL = (b'false', b'true')
+_PING_TEMPLATE = (
+    b'{"type":"success","message":"pong","server_info":{"server_type":"streaming_uhd",'
+    b'"uhd_imported":%s,"device_connected":%s,"streaming":%s,"data_clients":%d}}'
+)
+_STATUS_TEMPLATE = (
+    b'{"type":"success","message":"Status retrieved","status":{'
+    b'"uhd_imported":%s,"device_connected":%s,"streaming":%s,"data_clients":%d}}'
+)
+_STOP_STREAMING_RESPONSE = encode({
+    'type': ResponseType.SUCCESS.value,
+    'message': 'Data streaming stopped'
+})
+
+# Keepalive timing (idle seconds, probe interval, probe count) where the platform supports it
+_KEEPALIVE_OPTIONS = [
+    (getattr(socket, name), value) 
+    for name, value in (('TCP_KEEPIDLE', 30), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3))
+    if hasattr(socket, name)
+]
+
 class StreamingDataServer:
     """Server that handles both control commands and real-time data streaming"""
     
@@ -69,8 +111,7 @@ class StreamingDataServer:
         
         # Server state
         self.running = False
-        self.uhd_imported = False
-        self.uhd = None
+        self.uhd_imported = True # Imported with the module, shared by every client
         
         # USRP components (using your existing classes)
         self.usrp_device = None
@@ -78,8 +119,45 @@ class StreamingDataServer:
         
         # Data streaming
         self.streaming = False
-        self.data_clients = []  # List of connected data clients
+        self.data_clients = set()  # Connected data client sockets, fds are reused so they can't serve as keys
         self.data_lock = threading.Lock()
+        self._selector = None
+        self._writing = set() # Control clients also watched for writability, with replies left to send
+        
+        # Commands that wait on the device run one at a time on the device worker, so the I/O loop keeps 
+        # serving other clients. Their replies are queued and the loop woken through a socket pair.
+        self._device_worker = None # Started with the server
+        self._replies = queue.SimpleQueue()
+        self._in_flight = {} # Control client -> commands queued on the device worker
+        self._wake_recv = None
+        self._wake_send = None
+        
+        # Tracebacks are only formatted into error replies when debugging, see protocol.DEBUG
+        self.debug = DEBUG
+        
+        # Log records are queued here and printed by the listener while the server runs
+        self._log_queue = queue.SimpleQueue()
+        self._log_handler = None
+        log_output = logging.StreamHandler(sys.stdout)
+        log_output.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+        self._log_listener = QueueListener(self._log_queue, log_output)
+        
+        # Simulated frames are generated in place, they are fully sent before the next one
+        self._rng = np.random.default_rng()
+        self._sim_buf = np.empty((2, 100), dtype=np.float32)
+        
+        # Command value -> handler taking the command params
+        self._dispatch = {
+            CommandType.PING.value: lambda params: self.handle_ping(),
+            CommandType.DISCOVER_DEVICES.value: lambda params: self.handle_discover_devices(),
+            CommandType.CONNECT_DEVICE.value: self.handle_connect_device,
+            CommandType.DISCONNECT_DEVICE.value: lambda params: self.handle_disconnect_device(),
+            CommandType.CONFIGURE_DEVICE.value: self.handle_configure_device,
+            CommandType.START_STREAMING.value: self.handle_start_streaming,
+            CommandType.STOP_STREAMING.value: lambda params: self.handle_stop_streaming(),
+            CommandType.GET_STATUS.value: lambda params: self.handle_get_status(),
+            CommandType.SHUTDOWN.value: lambda params: self.handle_shutdown(),
+        }
         
     def start(self):
         """Start both control and data servers"""
@@ -102,19 +180,19 @@ class StreamingDataServer:
             
             self.running = True
             
-            print(f"✓ Control server listening on {self.control_host}:{self.control_port}")
-            print(f"✓ Data server listening on {self.control_host}:{self.data_port}")
+            self._log_handler = QueueHandler(self._log_queue)
+            logger.addHandler(self._log_handler)
+            logger.setLevel(logging.DEBUG if self.debug else logging.INFO)
+            logger.propagate = False
+            self._log_listener.start()
             
-            # Start server threads
-            control_thread = threading.Thread(target=self.run_control_server, daemon=True)
-            data_thread = threading.Thread(target=self.run_data_server, daemon=True)
+            self._device_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bioview-device')
             
-            control_thread.start()
-            data_thread.start()
+            print(f"✓ Control server listening on {self.control_host}:{self.control_port}")
+            print(f"✓ Data server listening on {self.control_host}:{self.data_port}")
             
-            # Keep main thread alive
-            while self.running:
-                time.sleep(0.1)
+            # Serve all sockets from the main thread
+            self.run_io_loop()
                 
         except Exception as e:
             print(f"Failed to start server: {e}")
@@ -129,88 +207,249 @@ class StreamingDataServer:
         # Stop streaming
         self.stop_data_streaming()
         
+        if self._device_worker is not None:
+            self._device_worker.shutdown(wait=False, cancel_futures=True)
+            self._device_worker = None
+        
         # Close sockets
         if self.control_socket:
             self.control_socket.close()
         if self.data_socket:
             self.data_socket.close()
+        
+        # Flush anything still queued from the streaming thread
+        if self._log_handler:
+            logger.removeHandler(self._log_handler)
+            self._log_handler = None
+            self._log_listener.stop()
             
         print("Server stopped")
     
-    def run_control_server(self):
-        """Run control command server"""
-        while self.running:
-            try:
-                client_socket, address = self.control_socket.accept()
-                print(f"Control client connected from {address}")
-                
-                client_thread = threading.Thread(
-                    target=self.handle_control_client,
-                    args=(client_socket,),
-                    daemon=True
-                )
-                client_thread.start()
-                
-            except Exception as e:
-                if self.running:
-                    print(f"Error accepting control connection: {e}")
+    def run_io_loop(self):
+        """Accept clients and serve control commands from a single selector loop
+        
+        Data clients are also watched for readability so that disconnects are noticed
+        without a monitoring thread per client.
+        """
+        # Non-blocking, so that each wakeup accepts every pending connection
+        self.control_socket.setblocking(False)
+        self.data_socket.setblocking(False)
+        
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        
+        selector = selectors.DefaultSelector()
+        selector.register(self.control_socket, selectors.EVENT_READ, self._accept_control_client)
+        selector.register(self.data_socket, selectors.EVENT_READ, self._accept_data_client)
+        selector.register(self._wake_recv, selectors.EVENT_READ, self._send_queued_replies)
+        self._selector = selector
+        
+        try:
+            while self.running:
+                for key, _ in selector.select(timeout=0.5):
+                    key.data(key.fileobj)
+        except OSError as e:
+            if self.running:
+                print(f"Server I/O error: {e}")
+        finally:
+            for key in list(selector.get_map().values()):
+                if key.fileobj not in (self.control_socket, self.data_socket):
+                    key.fileobj.close()
+            selector.close()
+            self._wake_send.close()
     
-    def run_data_server(self):
-        """Run data streaming server"""
-        while self.running:
+    def _accept_pending(self, server_socket):
+        """Yield every connection waiting on a non-blocking listening socket"""
+        while True:
             try:
-                client_socket, address = self.data_socket.accept()
-                print(f"Data client connected from {address}")
-                
-                with self.data_lock:
-                    self.data_clients.append(client_socket)
-                
-                # Handle client disconnect
-                def monitor_client(sock):
-                    try:
-                        while self.running:
-                            # Send keepalive
-                            sock.send(b'')
-                            time.sleep(1)
-                    except:
-                        with self.data_lock:
-                            if sock in self.data_clients:
-                                self.data_clients.remove(sock)
-                        sock.close()
-                        print(f"Data client {address} disconnected")
-                
-                threading.Thread(target=monitor_client, args=(client_socket,), daemon=True).start()
-                
-            except Exception as e:
-                if self.running:
-                    print(f"Error accepting data connection: {e}")
+                yield server_socket.accept()
+            except BlockingIOError:
+                return
+    
+    def _accept_control_client(self, server_socket):
+        for client_socket, address in self._accept_pending(server_socket):
+            print(f"Control client connected from {address}")
+            
+            # Replies are small and written whole, Nagle would only delay them
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+            # Non-blocking so that a client slow to read its replies cannot stall the loop
+            client_socket.setblocking(False)
+            
+            # Commands may arrive split across reads or several to a read, replies may leave across writes
+            self._selector.register(
+                client_socket, selectors.EVENT_READ, 
+                functools.partial(self._read_control_client, buf=bytearray(), outbox=bytearray())
+            )
+    
+    def _accept_data_client(self, server_socket):
+        for client_socket, address in self._accept_pending(server_socket):
+            print(f"Data client connected from {address}")
+            
+            # Let the kernel probe idle clients, dead peers then fail the next send
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in _KEEPALIVE_OPTIONS:
+                client_socket.setsockopt(socket.IPPROTO_TCP, option, value)
+            
+            # Frames go out whole through sendmsg, so there is nothing for Nagle to coalesce
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+            with self.data_lock:
+                self.data_clients.add(client_socket)
+            self._selector.register(client_socket, selectors.EVENT_READ, self._read_data_client)
     
-    def handle_control_client(self, client_socket):
+    def _read_control_client(self, client_socket, buf, outbox):
         """Handle control client"""
         try:
-            while self.running:
-                data = client_socket.recv(4096)
-                if not data:
-                    break
+            if outbox:
+                self._flush_replies(client_socket, outbox)
+            
+            try:
+                data = client_socket.recv(MAX_BUFFER_SIZE)
+            except BlockingIOError:
+                return # Only ready for writing
+            if not data:
+                raise ConnectionError("Control client disconnected")
+            
+            buf += data
+            
+            # Length-prefixed commands start with a zero byte, bare JSON never does
+            framed = buf[0] == 0
+            packed = framed and is_packed(buf) # msgpack commands are answered in msgpack
+            if framed:
+                commands, error = split_framed(buf), None
+            else:
+                commands, error = self._split_commands(buf)
+            for command in commands:
+                self._run_command(client_socket, command, outbox, framed, packed)
+            
+            if error is None and len(buf) > MAX_BUFFER_SIZE:
+                error = "no complete command received"
+            if error is not None:
+                buf.clear()
+                error_response = {
+                    'type': ResponseType.ERROR.value,
+                    'message': f"Invalid JSON: {error}"
+                }
+                if self._in_flight.get(client_socket):
+                    # Queued behind the commands still running, so replies stay in order
+                    self._in_flight[client_socket] += 1
+                    self._device_worker.submit(self._queue_reply, client_socket, error_response, outbox, framed, packed)
+                else:
+                    self._send_response(client_socket, error_response, outbox, framed, packed)
                 
-                try:
-                    command = json.loads(data.decode('utf-8'))
-                    response = self.process_command(command)
-                    
-                    response_data = json.dumps(response).encode('utf-8')
-                    client_socket.send(response_data)
-                    
-                except json.JSONDecodeError as e:
-                    error_response = {
-                        'type': ResponseType.ERROR.value,
-                        'message': f"Invalid JSON: {e}"
-                    }
-                    client_socket.send(json.dumps(error_response).encode('utf-8'))
-                    
         except Exception as e:
             print(f"Control client error: {e}")
-        finally:
+            self._close_control_client(client_socket)
+    
+    def _close_control_client(self, client_socket):
+        self._selector.unregister(client_socket)
+        self._writing.discard(client_socket)
+        self._in_flight.pop(client_socket, None)
+        client_socket.close()
+    
+    def _run_command(self, client_socket, command, outbox, framed, packed):
+        """Reply to quick commands directly, others are handed to the device worker"""
+        in_flight = self._in_flight.get(client_socket, 0)
+        if not in_flight and command.get('type') in _INLINE_COMMANDS:
+            self._send_response(client_socket, self.process_command(command), outbox, framed, packed)
+            return
+        
+        # Replies are matched to commands by order, so anything behind a queued command queues too
+        self._in_flight[client_socket] = in_flight + 1
+        self._device_worker.submit(self._run_queued_command, client_socket, command, outbox, framed, packed)
+    
+    def _run_queued_command(self, client_socket, command, outbox, framed, packed):
+        # Runs on the device worker
+        self._queue_reply(client_socket, self.process_command(command), outbox, framed, packed)
+    
+    def _queue_reply(self, client_socket, response, outbox, framed, packed):
+        self._replies.put((client_socket, response, outbox, framed, packed))
+        try:
+            self._wake_send.send(b'\0')
+        except OSError:
+            pass # Wakeup already pending, or the server is stopping
+    
+    def _send_queued_replies(self, wake_socket):
+        """Send replies from the device worker, on the I/O loop"""
+        try:
+            wake_socket.recv(MAX_BUFFER_SIZE)
+        except BlockingIOError:
+            pass
+        
+        while True:
+            try:
+                client_socket, response, outbox, framed, packed = self._replies.get_nowait()
+            except queue.Empty:
+                return
+            
+            if client_socket not in self._in_flight:
+                continue # Closed while its command ran
+            remaining = self._in_flight[client_socket] - 1
+            if remaining:
+                self._in_flight[client_socket] = remaining
+            else:
+                del self._in_flight[client_socket]
+            
+            try:
+                self._send_response(client_socket, response, outbox, framed, packed)
+            except Exception as e:
+                print(f"Control client error: {e}")
+                self._close_control_client(client_socket)
+    
+    def _send_response(self, client_socket, response, outbox, framed, packed):
+        if packed:
+            response = pack(response)
+        elif not isinstance(response, bytes): # Fixed-shape responses come pre-encoded
+            response = encode(response)
+        if framed:
+            outbox += FRAME_LENGTH.pack(len(response))
+        outbox += response
+        self._flush_replies(client_socket, outbox)
+    
+    def _flush_replies(self, client_socket, outbox):
+        """Write what the socket will take, watching for writability while anything is left"""
+        try:
+            sent = client_socket.send(outbox)
+        except BlockingIOError:
+            sent = 0
+        del outbox[:sent]
+        
+        # The selector is only touched when write interest changes, not on every reply
+        if bool(outbox) == (client_socket in self._writing):
+            return
+        if outbox:
+            self._writing.add(client_socket)
+            events = selectors.EVENT_READ | selectors.EVENT_WRITE
+        else:
+            self._writing.discard(client_socket)
+            events = selectors.EVENT_READ
+        self._selector.modify(client_socket, events, self._selector.get_key(client_socket).data)
+    
+    def _split_commands(self, buf):
+        """Consume every complete JSON command at the start of buf, see protocol.split_commands"""
+        try:
+            # Common case, the buffer holds exactly one command
+            command = decode(buf)
+            buf.clear()
+            return [command], None
+        except DecodeError:
+            return split_commands(buf)
+    
+    def _read_data_client(self, client_socket):
+        """Data clients only send to disconnect, anything else is discarded"""
+        try:
+            data = client_socket.recv(MAX_BUFFER_SIZE)
+        except OSError:
+            data = b''
+        
+        if not data:
+            with self.data_lock:
+                self.data_clients.discard(client_socket)
+            self._selector.unregister(client_socket)
             client_socket.close()
+            print("Data client disconnected")
     
     def process_command(self, command):
         """Process control commands"""
@@ -218,98 +457,61 @@ class StreamingDataServer:
         params = command.get('params', {})
         
         # Debug logging
-        print(f"📨 Received command: {json.dumps(command, indent=2)}")
-        print(f"🔍 Command type: '{cmd_type}' (type: {type(cmd_type)})")
-        print(f"📋 Available commands: {[cmd.value for cmd in CommandType]}")
+        if self.debug:
+            print(f"📨 Received command: {json.dumps(command, indent=2)}")
+            print(f"🔍 Command type: '{cmd_type}' (type: {type(cmd_type)})")
+            print(f"📋 Available commands: {_ALL_COMMANDS}")
         
         try:
-            if cmd_type == CommandType.PING.value:
-                return self.handle_ping()
-            elif cmd_type == CommandType.DISCOVER_DEVICES.value:
-                return self.handle_discover_devices()
-            elif cmd_type == CommandType.CONNECT_DEVICE.value:
-                return self.handle_connect_device(params)
-            elif cmd_type == CommandType.DISCONNECT_DEVICE.value:
-                return self.handle_disconnect_device()
-            elif cmd_type == CommandType.CONFIGURE_DEVICE.value:
-                return self.handle_configure_device(params)
-            elif cmd_type == CommandType.START_STREAMING.value:
-                return self.handle_start_streaming(params)
-            elif cmd_type == CommandType.STOP_STREAMING.value:
-                return self.handle_stop_streaming()
-            elif cmd_type == CommandType.GET_STATUS.value:
-                return self.handle_get_status()
-            elif cmd_type == CommandType.SHUTDOWN.value:
-                return self.handle_shutdown()
+            handler = self._dispatch.get(cmd_type)
+            if handler is not None:
+                return handler(params)
             else:
                 return {
                     'type': ResponseType.ERROR.value,
                     'message': f"Unknown command: '{cmd_type}'",
                     'received_command': command,
-                    'available_commands': [cmd.value for cmd in CommandType]
+                    'available_commands': _ALL_COMMANDS
                 }
                 
         except Exception as e:
-            return {
-                'type': ResponseType.ERROR.value,
-                'message': f"Command processing error: {e}",
-                'traceback': traceback.format_exc()
-            }
+            return self._error_response(f"Command processing error: {e}")
+    
+    def _error_response(self, message):
+        """Error reply, with the active traceback attached in debug mode"""
+        response = {
+            'type': ResponseType.ERROR.value,
+            'message': message
+        }
+        if self.debug:
+            response['traceback'] = traceback.format_exc()
+        return response
     
     def handle_ping(self):
         """Handle ping command"""
-        return {
-            'type': ResponseType.SUCCESS.value,
-            'message': 'pong',
-            'server_info': {
-                'server_type': 'streaming_uhd',
-                'uhd_imported': self.uhd_imported,
-                'device_connected': self.usrp_device is not None,
-                'streaming': self.streaming,
-                'data_clients': len(self.data_clients)
-            }
-        }
+        return _PING_TEMPLATE % (
+            _JSON_BOOL[bool(self.uhd_imported)],
+            _JSON_BOOL[self.usrp_device is not None],
+            _JSON_BOOL[bool(self.streaming)],
+            len(self.data_clients)
+        )
     
     def handle_discover_devices(self):
         """Handle device discovery"""
         print("🔍 Starting device discovery...")
         
-        if not self.uhd_imported:
-            try:
-                print("📦 Importing UHD...")
-                import uhd
-                self.uhd = uhd
-                self.uhd_imported = True
-                print("✓ UHD imported successfully")
-            except Exception as e:
-                return {
-                    'type': ResponseType.ERROR.value,
-                    'message': f'UHD import failed: {e}'
-                }
-        
         try:
-            print("🔍 Calling uhd.find()...")
-            devices = self.uhd.find("")
-            
-            device_list = []
-            for device in devices:
-                device_dict = dict(device)
-                device_list.append(device_dict)
-            
-            print(f"✓ Found {len(devices)} devices")
+            device_list = [dict(device) for device in uhd.find("")]
+            logger.debug(f"Found {len(device_list)} devices")
             
             return {
                 'type': ResponseType.SUCCESS.value,
-                'message': f'Found {len(devices)} devices',
+                'message': f'Found {len(device_list)} devices',
                 'devices': device_list
             }
             
         except Exception as e:
-            return {
-                'type': ResponseType.ERROR.value,
-                'message': f'Device discovery failed: {e}',
-                'traceback': traceback.format_exc()
-            }
+            return self._error_response(f'Device discovery failed: {e}')
     
     def handle_connect_device(self, params):
         """Handle device connection using your existing architecture"""
@@ -387,11 +589,7 @@ class StreamingDataServer:
                 }
                 
         except Exception as e:
-            return {
-                'type': ResponseType.ERROR.value,
-                'message': f'Device connection failed: {e}',
-                'traceback': traceback.format_exc()
-            }
+            return self._error_response(f'Device connection failed: {e}')
     
     def handle_start_streaming(self, params):
         """Start real-time data streaming"""
@@ -419,20 +617,13 @@ class StreamingDataServer:
             }
             
         except Exception as e:
-            return {
-                'type': ResponseType.ERROR.value,
-                'message': f'Failed to start streaming: {e}',
-                'traceback': traceback.format_exc()
-            }
+            return self._error_response(f'Failed to start streaming: {e}')
     
     def handle_stop_streaming(self):
         """Stop data streaming"""
         try:
             self.stop_data_streaming()
-            return {
-                'type': ResponseType.SUCCESS.value,
-                'message': 'Data streaming stopped'
-            }
+            return _STOP_STREAMING_RESPONSE
         except Exception as e:
             return {
                 'type': ResponseType.ERROR.value,
@@ -450,114 +641,140 @@ class StreamingDataServer:
     
     def _stream_data(self):
         """Stream real-time data to connected clients"""
-        print("📡 Data streaming thread started")
+        logger.info("📡 Data streaming thread started")
         
         # This is where you'd integrate with your ProcessWorker output
         # For now, simulate data streaming
         
+        # Resolved once, the device does not change while streaming
+        rx_queue = getattr(self.usrp_device, 'rx_queue', None)
+        process = self._simulate_processing
+        send = self._send_data_to_clients
+        
         while self.streaming and self.running:
             try:
                 # Get processed data from your ProcessWorker
                 # In your real implementation, you'd get this from the ProcessWorker's output queue
                 
                 # Simulate getting data (replace with actual data from ProcessWorker)
-                if hasattr(self.usrp_device, 'rx_queue'):
+                if rx_queue is not None:
                     try:
                         # Get raw data from receive worker
-                        raw_data = self.usrp_device.rx_queue.get(timeout=0.1)
+                        raw_data = rx_queue.get(timeout=0.05)
+                        timestamp = time.time()
                         
                         # Process data (you'd use your ProcessWorker here)
-                        processed_data = self._simulate_processing(raw_data)
+                        processed_data = process(raw_data)
                         
                         # Send to connected clients
-                        self._send_data_to_clients(processed_data)
+                        send(processed_data, timestamp)
                         
                     except queue.Empty:
                         continue
                 else:
                     # Simulate data for testing
                     time.sleep(0.01)  # 100 Hz update rate
-                    sim_data = np.random.random((2, 100)).astype(np.float32)
-                    self._send_data_to_clients(sim_data)
+                    self._rng.random(dtype=np.float32, out=self._sim_buf)
+                    send(self._sim_buf, time.time())
                     
             except Exception as e:
-                print(f"Streaming error: {e}")
+                logger.warning(f"Streaming error: {e}")
                 time.sleep(0.1)
         
-        print("📡 Data streaming thread stopped")
+        logger.info("📡 Data streaming thread stopped")
     
     def _simulate_processing(self, raw_data):
         """Simulate your ProcessWorker output (replace with actual ProcessWorker integration)"""
         # This is a placeholder - you'd integrate your actual ProcessWorker here
         if isinstance(raw_data, np.ndarray):
+            # Downsample for display first, so only the kept samples are converted
+            if raw_data.shape[-1] > 1000:
+                step = raw_data.shape[-1] // 1000
+                raw_data = raw_data[..., ::step]
+            
             # Convert complex data to magnitude for plotting
             if raw_data.dtype == np.complex64:
                 processed = np.abs(raw_data)
             else:
                 processed = raw_data
             
-            # Downsample for display
-            if processed.shape[-1] > 1000:
-                step = processed.shape[-1] // 1000
-                processed = processed[..., ::step]
-            
-            return processed.astype(np.float32)
+            return processed.astype(np.float32, copy=False)
         else:
             # Fallback simulation
-            return np.random.random((2, 100)).astype(np.float32)
+            self._rng.random(dtype=np.float32, out=self._sim_buf)
+            return self._sim_buf
     
-    def _send_data_to_clients(self, data):
-        """Send processed data to connected clients"""
-        if len(self.data_clients) == 0:
+    def _send_data_to_clients(self, data, timestamp):
+        """Send processed data, taken at timestamp, to connected clients"""
+        # Snapshot under the lock, sends happen without holding it
+        with self.data_lock:
+            clients = tuple(self.data_clients)
+        if not clients:
             return
         
         try:
             # Serialize data efficiently
-            data_bytes = self._serialize_data(data)
+            header_bytes, payload = self._serialize_data(data, timestamp)
             
             # Send to all connected clients
+            disconnected_clients = []
+            for client in clients:
+                try:
+                    send_buffers(client, header_bytes, payload)
+                except:
+                    disconnected_clients.append(client)
+            
+            if not disconnected_clients:
+                return
+            
+            # Remove disconnected clients, the I/O loop closes them once shut down
             with self.data_lock:
-                disconnected_clients = []
-                
-                for client in self.data_clients:
-                    try:
-                        # Send data length first, then data
-                        length_header = struct.pack('!I', len(data_bytes))
-                        client.send(length_header + data_bytes)
-                    except:
-                        disconnected_clients.append(client)
-                
-                # Remove disconnected clients
                 for client in disconnected_clients:
-                    self.data_clients.remove(client)
-                    client.close()
+                    if client not in self.data_clients:
+                        continue # Already reaped by the I/O loop
+                    self.data_clients.discard(client)
+                    try:
+                        client.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
                     
         except Exception as e:
-            print(f"Error sending data to clients: {e}")
-    
-    def _serialize_data(self, data):
-        """Efficiently serialize numpy data for transmission"""
-        # Create header with metadata
-        header = {
-            'shape': data.shape,
-            'dtype': str(data.dtype),
-            'timestamp': time.time()
-        }
+            logger.warning(f"Error sending data to clients: {e}")
+    
+    def _serialize_data(self, data, timestamp):
+        """Serialize numpy data for transmission, see protocol.py for the format
         
-        # Convert to bytes
-        header_bytes = json.dumps(header).encode('utf-8')
-        header_length = struct.pack('!I', len(header_bytes))
-        data_bytes = data.tobytes()
+        Returns the length prefix and frame header as bytes, along with a byte view over 
+        the array buffer so that it can be sent without copying.
+        """
+        if data.ndim > 2: 
+            raise ValueError(f'Only 1D and 2D arrays can be streamed, got shape {data.shape}')
         
-        return header_length + header_bytes + data_bytes
+        data = np.ascontiguousarray(data)
+        payload = memoryview(data.reshape(-1).view(np.uint8))
+        header_bytes = FRAME_LENGTH.pack(FRAME_HEADER.size + payload.nbytes) + FRAME_HEADER.pack(
+            DTYPE_CODES[data.dtype.name], 
+            data.ndim, 
+            data.shape[0], 
+            data.shape[1] if data.ndim == 2 else 0, 
+            timestamp, 
+            payload.nbytes
+        )
+        
+        return header_bytes, payload
     
     def _log_callback(self, level, message):
         """Callback for log events from USRP components"""
-        print(f"[{level.upper()}] {message}")
+        lvl = getattr(logging, level.upper(), logging.INFO)
+        # Workers may pass a (format, *args) tuple, left to logging to format
+        if isinstance(message, tuple):
+            logger.log(lvl, message[0], *message[1:])
+        else:
+            logger.log(lvl, message)
     
     def _connection_callback(self, status):
         """Callback for connection state changes"""
-        print(f"Connection status: {status}")
+        logger.info(f"Connection status: {status}")
     
     def handle_disconnect_device(self):
         """Handle device disconnection"""
@@ -606,16 +823,12 @@ class StreamingDataServer:
     
     def handle_get_status(self):
         """Get current status"""
-        return {
-            'type': ResponseType.SUCCESS.value,
-            'message': 'Status retrieved',
-            'status': {
-                'uhd_imported': self.uhd_imported,
-                'device_connected': self.usrp_device is not None,
-                'streaming': self.streaming,
-                'data_clients': len(self.data_clients)
-            }
-        }
+        return _STATUS_TEMPLATE % (
+            _JSON_BOOL[bool(self.uhd_imported)],
+            _JSON_BOOL[self.usrp_device is not None],
+            _JSON_BOOL[bool(self.streaming)],
+            len(self.data_clients)
+        )
     
     def handle_shutdown(self):
         """Handle server shutdown"""
@@ -1,10 +1,184 @@
 '''
 Declares commonly supported commands that may be supported wholly or in part by different servers and clients 
 '''
+import codecs
+import functools
+import json
+import os
+import re
+import socket
+import struct
 from enum import Enum 
 
+# Prefer orjson for (de)serializing messages, it takes and returns bytes directly
+try: 
+    import orjson
+    
+    def encode(obj) -> bytes: 
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    
+    decode = orjson.loads
+    DecodeError = orjson.JSONDecodeError
+except ImportError: 
+    def encode(obj) -> bytes: 
+        return json.dumps(obj).encode('utf-8')
+    
+    decode = json.loads # Accepts bytes as well
+    DecodeError = json.JSONDecodeError
+
+# Framed commands may also be msgpack, where it is installed
+try: 
+    import msgpack
+except ImportError: 
+    msgpack = None
+
 MAX_BUFFER_SIZE = 4096
 
+# Servers add tracebacks to error replies and log per-command detail when BIOVIEW_DEBUG=1
+DEBUG = os.environ.get('BIOVIEW_DEBUG') == '1'
+
+''' 
+Streamed data frames are sent as 
+    [u32 frame length][frame header][array bytes]
+where the frame header is FRAME_HEADER below, in network byte order -  
+    u8  dtype code (see DTYPE_CODES)
+    u8  number of dimensions (1 or 2)
+    u32 first dimension
+    u32 second dimension (0 for 1D arrays)
+    f64 timestamp (seconds since epoch)
+    u32 number of array bytes
+
+Control commands may use the same framing, [u32 length][JSON command], 
+in which case replies are framed the same way. Bare JSON is still 
+accepted, a leading zero byte tells the two apart. Framed commands 
+may be msgpack instead of JSON, and are then answered in msgpack. 
+A msgpack map starts with a byte of 0x80 or above, JSON never does. 
+'''
+FRAME_LENGTH = struct.Struct('!I')
+FRAME_HEADER = struct.Struct('!BBIIdI')
+
+DTYPE_CODES = {
+    'float32': 1, 
+    'complex64': 2, 
+    'float64': 3, 
+    'complex128': 4, 
+    'int16': 5, 
+    'int32': 6,
+}
+DTYPE_NAMES = {code: name for name, code in DTYPE_CODES.items()}
+
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg') # Unavailable on Windows
+
+def send_buffers(sock, *buffers):
+    """Send buffers back to back with scatter-gather I/O, without concatenating them"""
+    if not _HAS_SENDMSG:
+        for buffer in buffers:
+            sock.sendall(buffer)
+        return
+    
+    # Common case, the kernel takes everything in one call
+    views = [memoryview(buffer) for buffer in buffers]
+    sent = sock.sendmsg(views)
+    while True:
+        # Drop fully sent buffers and trim a partially sent one
+        while views and sent >= views[0].nbytes:
+            sent -= views[0].nbytes
+            views.pop(0)
+        if not views:
+            return
+        if sent:
+            views[0] = views[0][sent:]
+        sent = sock.sendmsg(views)
+
+def is_packed(buf): 
+    """Whether the framed command at the start of buf is msgpack"""
+    return msgpack is not None and len(buf) > FRAME_LENGTH.size and buf[FRAME_LENGTH.size] >= 0x80
+
+def pack(obj) -> bytes: 
+    """Encode a reply as msgpack, replies already encoded as JSON are converted"""
+    if isinstance(obj, bytes):
+        return _repack(obj)
+    return msgpack.packb(obj, use_bin_type=True)
+
+@functools.lru_cache(maxsize=64)
+def _repack(data): 
+    # Pre-encoded replies are few and reused, so each is converted once
+    return msgpack.packb(decode(data), use_bin_type=True)
+
+def split_framed(buf): 
+    """Consume every complete length-prefixed command at the start of buf"""
+    commands = []
+    pos = 0
+    while len(buf) - pos >= FRAME_LENGTH.size:
+        (length,) = FRAME_LENGTH.unpack_from(buf, pos)
+        if length > MAX_BUFFER_SIZE:
+            raise ValueError(f"Command of {length} bytes exceeds the {MAX_BUFFER_SIZE} byte limit")
+        
+        end = pos + FRAME_LENGTH.size + length
+        if end > len(buf):
+            break
+        payload = buf[pos + FRAME_LENGTH.size:end]
+        if msgpack is not None and payload and payload[0] >= 0x80:
+            commands.append(msgpack.unpackb(payload, raw=False))
+        else:
+            commands.append(decode(payload))
+        pos = end
+    
+    del buf[:pos]
+    return commands
+
+# Finds command boundaries when bare JSON commands are split across or share reads
+_SCANNER = json.JSONDecoder()
+# Strings (skipped whole, a lone quote is one left open) and brackets, for finding where an object ends
+_STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*"|"|[\[\]{}]', re.S)
+
+def _is_closed(text, pos): 
+    """Whether the object or array starting at pos has its closing bracket in text"""
+    depth = 0
+    for match in _STRUCTURE.finditer(text, pos):
+        token = match.group()
+        if token == '"':
+            return False
+        if token in '{[':
+            depth += 1
+        elif token in '}]':
+            depth -= 1
+            if depth == 0:
+                return True
+    return False
+
+def split_commands(buf): 
+    """Consume every complete JSON command at the start of buf
+    
+    Returns the commands along with the error for malformed input, which is then discarded. 
+    Input that is merely cut short is left in buf for the next read.
+    """
+    text, _ = codecs.utf_8_decode(bytes(buf), 'strict', False)
+    commands = []
+    pos = 0
+    try:
+        while True:
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            if pos == len(text):
+                break
+            command, pos = _SCANNER.raw_decode(text, pos)
+            commands.append(command)
+    except json.JSONDecodeError as e:
+        # Errors inside an object that has not been closed yet, e.g. one cut in the middle of a number 
+        # or an escape, are from input cut short rather than malformed
+        if text[pos] in '{[' and not _is_closed(text, pos):
+            pass
+        else:
+            rest = text[e.pos:]
+            if not (rest == '' or e.msg.startswith('Unterminated') 
+                    or any(literal.startswith(rest) for literal in ('true', 'false', 'null'))):
+                buf.clear()
+                return commands, e
+    
+    del buf[:len(text[:pos].encode('utf-8'))]
+    return commands, None
+
 # Command from client to server 
 class Command(Enum): 
     PING = 'ping'
@@ -9,25 +9,61 @@ require a main client and other observer clients or whether every client needs t
 the same level of access or whether each device should be considered as a different client 
 connection. Subsequent experimentation and discussion will be pertinent for expanding 
 functionality to handle the case for multiple clients. 
+
+For the same reason, the listening sockets are served by one I/O thread rather than sharded 
+across workers with SO_REUSEPORT, since each worker would hold its own copy of device state. 
 """
 
 import uhd # Crashes occur without this
 
+import copy
+import functools
+import logging
+import selectors
 import socket
-import json
 import time
 import os
 import sys
+import queue
+import signal
+import threading
 from threading import Thread, Lock
 import multiprocessing as mp
 import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging.handlers import QueueHandler, QueueListener
+
+import numpy as np
 
 from bioview.device import discover_devices
 from bioview.constants import BIOVIEW_VERSION
 from bioview.datatypes import Configuration
 from bioview.device import get_device_object
 
-from bioview.listeners.protocol import Command, Response, MAX_BUFFER_SIZE
+from bioview.listeners.protocol import (
+    Command, Response, encode, decode, DecodeError, send_buffers, split_framed, split_commands, is_packed, pack, 
+    MAX_BUFFER_SIZE, DEBUG, FRAME_LENGTH, FRAME_HEADER, DTYPE_CODES
+)
+
+# Device handlers run in their own processes. The forkserver starts each one from a process 
+# that has already imported the heavy modules, rather than paying for the imports every time
+if 'forkserver' in mp.get_all_start_methods():
+    _mp = mp.get_context('forkserver')
+    _mp.set_forkserver_preload(['uhd', 'numpy', 'bioview.device'])
+else:
+    _mp = mp.get_context('spawn')
+
+# Seconds to wait for a device handler process to carry out a request
+DEVICE_REQUEST_TIMEOUT = 10
+
+logger = logging.getLogger('bioview.server')
+
+# Most frames taken off the data queue to send together
+DATA_BATCH_SIZE = 32
+
+# Formatting tracebacks is costly and only of use while debugging, set BIOVIEW_DEBUG=1 to add them to error replies
+INCLUDE_TRACEBACKS = DEBUG
 
 SUPPORTED_COMMANDS = [
     Command.PING,
@@ -43,221 +79,548 @@ SUPPORTED_COMMANDS = [
     Command.SHUTDOWN
 ]
 
+# Reply types, resolved from the enum once rather than in every reply
+SUCCESS = Response.SUCCESS.value
+ERROR = Response.ERROR.value
+
+# Answered straight from the I/O thread, everything else may wait on devices and runs on the device worker
+INLINE_COMMANDS = frozenset((Command.PING.value, Command.STATUS.value))
+
+@functools.lru_cache(maxsize=64)
+def _parse_config(config_json): 
+    # Clients tend to resend the same configuration on reconnect or re-init
+    return Configuration.from_json(config_json)
+
+def _load_config(config_json): 
+    # Each handler gets its own copy, parameter updates set attributes on it
+    return copy.copy(_parse_config(config_json))
+
+def _error_response(message): 
+    """Error reply, with the traceback of the exception being handled if INCLUDE_TRACEBACKS is set"""
+    response = {'type': ERROR, 'message': message}
+    if INCLUDE_TRACEBACKS:
+        response['traceback'] = traceback.format_exc()
+    return response
+
+# Replies that never change are encoded once
+_CONNECT_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Connect successful'
+})
+_DISCONNECT_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Disconnect successful'
+})
+_STOP_STREAMING_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Data streaming stopped'
+})
+_INIT_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Device inited successfully'
+})
+_CONFIG_UPDATED_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Config updated'
+})
+_PARAMS_UPDATED_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Params updated'
+})
+_SHUTDOWN_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Server shutting down'
+})
+_START_STREAMING_RESPONSE = encode({
+    'type': SUCCESS,
+    'message': 'Data streaming started'
+})
+_NOT_INITIALIZED_RESPONSE = encode({
+    'type': ERROR,
+    'message': 'Device not initialized'
+})
+_NO_DEVICE_RESPONSE = encode({
+    'type': ERROR,
+    'message': 'No device connected'
+})
+
+# Ping only varies in the device count and streaming flag, the rest is encoded once
+_JSON_BOOL = (b'false', b'true')
+_PING_TEMPLATE = (
+    b'{"type":"success","message":"pong","server_info":{"python_version":' + encode(sys.version).replace(b'%', b'%%') + 
+    b',"platform":' + encode(sys.platform).replace(b'%', b'%%') + b',"devices":%d,"is_streaming":%s}}'
+)
+
+def _set_nodelay(sock): 
+    """Disable Nagle's algorithm, which only applies to TCP"""
+    if sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
 class Server:
-    def __init__(self, address='localhost', control_port=9999, data_port=9998):
+    # Fixed attributes, so a mistyped name raises instead of quietly adding a new one
+    __slots__ = (
+        'address', 'control_port', 'data_port', 'socket_path', 'socket_buffer_size', 'io_cpu', 
+        'control_socket', 'data_socket', 'data_clients', 'data_lock', '_selector', '_recv_buf', '_recv_view', '_writing', 
+        '_device_worker', '_replies', '_in_flight', '_wake_recv', '_wake_send', 
+        'running', 'is_streaming', '_stop_event', '_data_thread', '_status_cache', 
+        '_log_queue', '_log_handler', '_log_listener', 
+        'device_handlers', '_handlers', 'discovered_devices', '_discovery_pool', 'data_queue', '_dispatch', 
+    )
+    
+    def __init__(self, address='localhost', control_port=9999, data_port=9998, socket_buffer_size=4 << 20, io_cpu=None, 
+                 socket_path=None):
         self.address = address # This can be a list 
         self.control_port = control_port
         self.data_port = data_port
         
+        # Serve same-host clients over UNIX domain sockets at <socket_path>.control and <socket_path>.data, 
+        # skipping the TCP/IP stack. None serves over TCP at address instead.
+        self.socket_path = socket_path
+        
+        # Kernel send/receive buffer size for client sockets, None leaves it to OS autotuning. 
+        # Linux caps this at net.core.{r,w}mem_max, e.g. sysctl -w net.core.wmem_max=12582912
+        self.socket_buffer_size = socket_buffer_size
+        
+        # CPU to pin the I/O thread to, ideally the one handling the NIC's interrupts (see /proc/interrupts)
+        self.io_cpu = io_cpu
+        
         # Sockets
         self.control_socket = None
         self.data_socket = None
-        self.data_clients = []  # List of connected data clients
-        self.data_lock = Lock()
+        self.data_clients = ()  # Connected data clients, replaced rather than mutated so readers need no lock
+        self.data_lock = Lock() # Serializes writers
+        self._selector = None
+        
+        # Commands are read one at a time on the selector thread, so one buffer serves every client
+        self._recv_buf = bytearray(MAX_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
+        self._writing = set() # Control clients also watched for writability, with replies left to send
+        
+        # Commands that wait on devices run one at a time on the device worker, so the I/O thread keeps 
+        # serving other clients. Their replies are queued and the I/O thread woken through a socket pair.
+        self._device_worker = None # Started with the server
+        self._replies = queue.SimpleQueue()
+        self._in_flight = {} # Control client -> commands queued on the device worker
+        self._wake_recv = None
+        self._wake_send = None
         
         # Server state
         self.running = False
         self.is_streaming = False
+        self._stop_event = threading.Event() # Parks the main thread until stop()
+        self._data_thread = None # Forwards frames to data clients while streaming
+        self._status_cache = (None, None, b'') # Devices and streaming flag last encoded, with the encoding
+        
+        # Log records are queued here and printed by the listener while the server runs, 
+        # so the I/O thread never waits on stdout
+        self._log_queue = queue.SimpleQueue()
+        self._log_handler = None
+        log_output = logging.StreamHandler(sys.stdout)
+        log_output.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+        self._log_listener = QueueListener(self._log_queue, log_output)
 
         # Device state
-        self.device_handlers = [] 
-        self.data_queue = mp.Queue()
+        self.device_handlers = {} # Keyed by device ID
+        self._handlers = () # Snapshot of device_handlers.values(), refreshed on init
+        self.discovered_devices = [] # Replaced by each discovery, status replies read it before any
+        self._discovery_pool = None # Worker process for discovery, started on first use
+        # Frames from the device handler processes
+        self.data_queue = _mp.Queue()
         
+        # Command handlers by type, each called with the command's params
+        self._dispatch = {
+            Command.PING.value: lambda params: self.handle_ping(),
+            Command.DISCOVER.value: lambda params: self.handle_discover_devices(),
+            Command.INIT.value: self.handle_init_device,
+            Command.CONNECT.value: lambda params: self.handle_connect_device(),
+            Command.DISCONNECT.value: lambda params: self.handle_disconnect_device(),
+            Command.START.value: lambda params: self.handle_start_streaming(),
+            Command.STOP.value: lambda params: self.handle_stop_streaming(),
+            Command.STATUS.value: lambda params: self.handle_get_status(),
+            Command.CONFIGURE.value: self.handle_update_device_config,
+            Command.UPDATE.value: self.handle_update_device_param,
+            Command.SHUTDOWN.value: lambda params: self.handle_shutdown(),
+        }
         
     def start(self):
         print(f'Starting server at {self.address}:{self.control_port} (Control), {self.address}:{self.data_port} (Data)')
         
+        # Per-command progress is logged at debug level, quiet unless BIOVIEW_DEBUG=1
+        self._log_handler = QueueHandler(self._log_queue)
+        logger.addHandler(self._log_handler)
+        logger.setLevel(logging.DEBUG if INCLUDE_TRACEBACKS else logging.INFO)
+        logger.propagate = False
+        self._log_listener.start()
+        
+        self._device_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bioview-device')
+        
         try:     
-            self.control_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.control_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.control_socket.bind((self.address, self.control_port))
-            self.control_socket.listen(5)
-            print(f"✓ Control server listening on {self.address}:{self.control_port}")
+            self.control_socket = self._listen('control', self.control_port, 5)
             
             # Start data server
-            self.data_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.data_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.data_socket.bind((self.address, self.data_port))
-            self.data_socket.listen(10)  # More clients for data
-            print(f"✓ Data server listening on {self.address}:{self.data_port}")
+            self.data_socket = self._listen('data', self.data_port, 10) # More clients for data
         except Exception as e: 
             print(f'Error occurred while starting server: {e}')
         
         # Once client have started, start listening
         self.running = True
+        self._stop_event.clear()
+        
+        # Ctrl-C wakes the parked main thread directly, signals can only be set from the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, lambda *_: self._stop_event.set())
+        
         try:
-            # Start server threads
+            # Start server thread, which serves both control and data sockets
             control_thread = Thread(target=self.run_control_server, daemon=True)
-            data_thread = Thread(target=self.run_data_server, daemon=True)
-            
             control_thread.start()
-            data_thread.start()
             
             # Keep main thread alive
-            while self.running:
-                time.sleep(0.1)
+            self._stop_event.wait()
         except Exception as e:
             print(f"Server error: {e}")
         finally:
             self.stop()
     
+    def _listen(self, name, port, backlog): 
+        """Create a listening socket, on a UNIX domain socket if socket_path is set"""
+        if self.socket_path:
+            endpoint = f"{self.socket_path}.{name}"
+            # Left behind by a server that did not stop cleanly
+            if os.path.exists(endpoint):
+                os.unlink(endpoint)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._tune_socket(sock)
+            sock.bind(endpoint)
+        else:
+            endpoint = f"{self.address}:{port}"
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._tune_socket(sock)
+            sock.bind((self.address, port))
+        
+        sock.listen(backlog)
+        print(f"✓ {name.capitalize()} server listening on {endpoint}")
+        return sock
+    
+    def _tune_socket(self, sock): 
+        """Size kernel buffers, set on listening sockets so they are in place before the handshake"""
+        if self.socket_buffer_size:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+    
     def stop(self):
         print(f'Stopping server at {self.address}:{self.control_port} (Control), {self.address}:{self.data_port} (Data)')
         self.running = False 
+        self._stop_event.set()
+        
+        if self._device_worker is not None:
+            self._device_worker.shutdown(wait=False, cancel_futures=True)
+            self._device_worker = None
+        
+        for handler in self._handlers:
+            handler.shutdown()
+        
+        if self._discovery_pool is not None:
+            self._discovery_pool.shutdown(wait=False, cancel_futures=True)
+            self._discovery_pool = None
         
         # Close sockets
         if self.control_socket:
             self.control_socket.close()
         if self.data_socket:
             self.data_socket.close()
+        
+        if self.socket_path:
+            for name in ('control', 'data'):
+                try:
+                    os.unlink(f"{self.socket_path}.{name}")
+                except OSError:
+                    pass
+        
+        # Flush anything still queued from the I/O and data threads
+        if self._log_handler:
+            logger.removeHandler(self._log_handler)
+            self._log_handler = None
+            self._log_listener.stop()
             
         print("Client server stopped")
         
     def run_control_server(self): 
-        while self.running:
+        """Accept clients and serve control commands from a single selector loop
+        
+        Data clients are watched for readability too, they only become readable on disconnect
+        """
+        # On Linux, pid 0 pins only the calling thread
+        if self.io_cpu is not None and hasattr(os, 'sched_setaffinity'):
             try:
-                client_socket, address = self.control_socket.accept()
-                print(f"Control client connected from {address}")
-                
-                client_thread = Thread(
-                    target=self.handle_commands,
-                    args=(client_socket,),
-                    daemon=True
-                )
-                client_thread.start()
-                
-            except Exception as e:
-                if self.running:
-                    print(f"Error accepting control connection: {e}")
-            
-    def run_data_server(self): 
-        """Run data streaming server"""
-        while self.running:
+                os.sched_setaffinity(0, {self.io_cpu})
+            except OSError as e:
+                logger.warning(f"Unable to pin I/O thread to CPU {self.io_cpu}: {e}")
+        
+        # Non-blocking, so that each wakeup accepts every pending connection
+        self.control_socket.setblocking(False)
+        self.data_socket.setblocking(False)
+        
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.control_socket, selectors.EVENT_READ, self._accept_control_client)
+        self._selector.register(self.data_socket, selectors.EVENT_READ, self.run_data_server)
+        self._selector.register(self._wake_recv, selectors.EVENT_READ, self._send_queued_replies)
+        
+        try:
+            while self.running:
+                # Time out periodically so that stop() is noticed
+                for key, _ in self._selector.select(timeout=0.5):
+                    key.data(key.fileobj)
+        except Exception as e:
+            if self.running:
+                logger.error(f"Control server error: {e}")
+        finally:
+            for key in list(self._selector.get_map().values()):
+                if key.fileobj not in (self.control_socket, self.data_socket):
+                    key.fileobj.close()
+            self._selector.close()
+            self._wake_send.close()
+    
+    def _accept_pending(self, server_socket): 
+        """Yield every connection waiting on a non-blocking listening socket"""
+        while True:
             try:
-                client_socket, address = self.data_socket.accept()
-                print(f"Data client connected from {address}")
-                
-                with self.data_lock:
-                    self.data_clients.append(client_socket)
-                
-                # Handle client disconnect
-                def monitor_client(sock):
-                    try:
-                        while self.running:
-                            # Send keepalive
-                            sock.send(b'')
-                            time.sleep(1)
-                    except:
-                        with self.data_lock:
-                            if sock in self.data_clients:
-                                self.data_clients.remove(sock)
-                        sock.close()
-                        print(f"Data client {address} disconnected")
-                
-                Thread(target=monitor_client, args=(client_socket,), daemon=True).start()
-                
-            except Exception as e:
+                yield server_socket.accept()
+            except BlockingIOError:
+                return
+            except OSError as e:
                 if self.running:
-                    print(f"Error accepting data connection: {e}")
+                    logger.warning(f"Error accepting connection: {e}")
+                return
+    
+    def _accept_control_client(self, server_socket): 
+        for client_socket, address in self._accept_pending(server_socket):
+            logger.info(f"Control client connected from {address}")
+            
+            # Replies are small and written whole, Nagle would only delay them
+            _set_nodelay(client_socket)
+            
+            # Non-blocking so that a client slow to read its replies cannot stall the loop
+            client_socket.setblocking(False)
+            
+            # Length-prefixed commands may arrive split across reads, replies may leave across writes
+            pending = bytearray()
+            outbox = bytearray()
+            self._selector.register(
+                client_socket, selectors.EVENT_READ, 
+                functools.partial(self.handle_commands, pending=pending, outbox=outbox)
+            )
+            
+    def run_data_server(self, server_socket): 
+        """Accept data streaming clients"""
+        for client_socket, address in self._accept_pending(server_socket):
+            logger.info(f"Data client connected from {address}")
+            _set_nodelay(client_socket)
+            
+            with self.data_lock:
+                self.data_clients = self.data_clients + (client_socket,)
+            self._selector.register(
+                client_socket, selectors.EVENT_READ, 
+                functools.partial(self._monitor_data_client, address=address)
+            )
     
-    def handle_commands(self, client_socket): 
-        # Receives commands from clients and controls device handlers accordingly
+    def _monitor_data_client(self, client_socket, address): 
+        """Data clients only send to disconnect, anything else is discarded"""
         try:
-            while self.running:
-                data = client_socket.recv(MAX_BUFFER_SIZE)
-                if not data:
-                    break
-                
+            data = client_socket.recv(MAX_BUFFER_SIZE)
+        except OSError:
+            data = b''
+        
+        if not data:
+            with self.data_lock:
+                self.data_clients = tuple(c for c in self.data_clients if c is not client_socket)
+            self._selector.unregister(client_socket)
+            client_socket.close()
+            logger.info(f"Data client {address} disconnected")
+    
+    def handle_commands(self, client_socket, pending, outbox): 
+        # Receives commands from a ready client and controls device handlers accordingly
+        try:
+            if outbox:
+                self._flush_replies(client_socket, outbox)
+            
+            try:
+                num_bytes = client_socket.recv_into(self._recv_view)
+            except BlockingIOError:
+                return # Only ready for writing
+            if not num_bytes:
+                raise ConnectionError("Control client disconnected")
+            
+            # Common case, a bare JSON command that arrived whole, parsed straight from the read buffer
+            if not pending and self._recv_buf[0] != 0:
                 try:
-                    command = json.loads(data.decode('utf-8'))
-                    response = self.process_command(command)
-                    
-                    response_data = json.dumps(response).encode('utf-8')
-                    client_socket.send(response_data)
-                except json.JSONDecodeError as e:
-                    error_response = {
-                        'type': Response.ERROR.value,
-                        'message': f"Invalid JSON: {e}"
-                    }
-                    client_socket.send(json.dumps(error_response).encode('utf-8'))
+                    command = decode(self._recv_buf[:num_bytes])
+                except DecodeError:
+                    pass
+                else:
+                    self._run_command(client_socket, command, outbox)
+                    return
+            
+            # Otherwise reassemble, length-prefixed commands start with a zero byte and bare JSON never does
+            pending += self._recv_view[:num_bytes]
+            framed = pending[0] == 0
+            packed = framed and is_packed(pending) # Answered in kind
+            if framed:
+                commands, error = split_framed(pending), None
+            else:
+                commands, error = split_commands(pending)
+            
+            for command in commands:
+                self._run_command(client_socket, command, outbox, framed=framed, packed=packed)
+            
+            if error is None and len(pending) > MAX_BUFFER_SIZE:
+                error = "no complete command received"
+            if error is not None:
+                pending.clear()
+                error_response = {
+                    'type': ERROR,
+                    'message': f"Invalid JSON: {error}"
+                }
+                if self._in_flight.get(client_socket):
+                    # Queued behind the commands still running, so replies stay in order
+                    self._in_flight[client_socket] += 1
+                    self._device_worker.submit(self._queue_reply, client_socket, error_response, outbox, framed, packed)
+                else:
+                    self._send_response(client_socket, error_response, outbox, framed=framed, packed=packed)
                     
         except Exception as e:
-            print(f"Control client error: {e}")
-        finally:
-            client_socket.close()
+            logger.info(f"Control client error: {e}")
+            self._close_control_client(client_socket)
+    
+    def _close_control_client(self, client_socket): 
+        self._selector.unregister(client_socket)
+        self._writing.discard(client_socket)
+        self._in_flight.pop(client_socket, None)
+        client_socket.close()
+    
+    def _run_command(self, client_socket, command, outbox, framed=False, packed=False): 
+        """Reply to quick commands directly, others are handed to the device worker"""
+        in_flight = self._in_flight.get(client_socket, 0)
+        if not in_flight and command.get('type') in INLINE_COMMANDS:
+            self._send_response(client_socket, self.process_command(command), outbox, framed=framed, packed=packed)
+            return
+        
+        # Replies are matched to commands by order, so anything behind a queued command queues too
+        self._in_flight[client_socket] = in_flight + 1
+        self._device_worker.submit(self._run_queued_command, client_socket, command, outbox, framed, packed)
+    
+    def _run_queued_command(self, client_socket, command, outbox, framed, packed): 
+        # Runs on the device worker
+        self._queue_reply(client_socket, self.process_command(command), outbox, framed, packed)
+    
+    def _queue_reply(self, client_socket, response, outbox, framed, packed): 
+        self._replies.put((client_socket, response, outbox, framed, packed))
+        try:
+            self._wake_send.send(b'\0')
+        except OSError:
+            pass # Wakeup already pending, or the server is stopping
+    
+    def _send_queued_replies(self, wake_socket): 
+        """Send replies from the device worker, on the I/O thread"""
+        try:
+            wake_socket.recv(MAX_BUFFER_SIZE)
+        except BlockingIOError:
+            pass
+        
+        while True:
+            try:
+                client_socket, response, outbox, framed, packed = self._replies.get_nowait()
+            except queue.Empty:
+                return
+            
+            if client_socket not in self._in_flight:
+                continue # Closed while its command ran
+            remaining = self._in_flight[client_socket] - 1
+            if remaining:
+                self._in_flight[client_socket] = remaining
+            else:
+                del self._in_flight[client_socket]
+            
+            try:
+                self._send_response(client_socket, response, outbox, framed=framed, packed=packed)
+            except Exception as e:
+                logger.info(f"Control client error: {e}")
+                self._close_control_client(client_socket)
+    
+    def _send_response(self, client_socket, response, outbox, framed=False, packed=False): 
+        if packed:
+            response = pack(response)
+        elif not isinstance(response, bytes): # Fixed responses come pre-encoded
+            response = encode(response)
+        if framed:
+            outbox += FRAME_LENGTH.pack(len(response))
+        outbox += response
+        self._flush_replies(client_socket, outbox)
+    
+    def _flush_replies(self, client_socket, outbox): 
+        """Write what the socket will take, watching for writability while anything is left"""
+        try:
+            sent = client_socket.send(outbox)
+        except BlockingIOError:
+            sent = 0
+        del outbox[:sent]
+        
+        # The selector is only touched when write interest changes, not on every reply
+        if bool(outbox) == (client_socket in self._writing):
+            return
+        if outbox:
+            self._writing.add(client_socket)
+            events = selectors.EVENT_READ | selectors.EVENT_WRITE
+        else:
+            self._writing.discard(client_socket)
+            events = selectors.EVENT_READ
+        self._selector.modify(client_socket, events, self._selector.get_key(client_socket).data)
     
     def process_command(self, command):
         """Process incoming commands"""
         cmd_type = command.get('type')
         
-        # TODO: Add -> UPDATE = 'update_param'       
         try:
-            if cmd_type == Command.PING.value:
-                return self.handle_ping()
-            elif cmd_type == Command.DISCOVER.value:
-                return self.handle_discover_devices()
-            elif cmd_type == Command.INIT.value: 
-                return self.handle_init_device(command.get('params', {})) 
-            elif cmd_type == Command.CONNECT.value:
-                return self.handle_connect_device()
-            elif cmd_type == Command.DISCONNECT.value:
-                return self.handle_disconnect_device()
-            elif cmd_type == Command.START.value:
-                return self.handle_start_streaming()
-            elif cmd_type == Command.STOP_STREAMING.value:
-                return self.handle_stop_streaming()
-            elif cmd_type == Command.STATUS.value:
-                return self.handle_get_status()
-            elif cmd_type == Command.CONFIGURE.value:
-                return self.handle_update_device_config(command.get('params', {}))
-            elif cmd_type == Command.UPDATE.value: 
-                return self.handle_update_device_param(command.get('params', {}))
-            elif cmd_type == Command.SHUTDOWN.value:
-                return self.handle_shutdown()
+            handler = self._dispatch.get(cmd_type)
+            if handler is not None:
+                return handler(command.get('params', {}))
             else:
                 return {
-                    'type': Response.ERROR.value,
+                    'type': ERROR,
                     'message': f"Unknown command: {cmd_type}"
                 }
                 
         except Exception as e:
-            return {
-                'type': Response.ERROR.value,
-                'message': f"Command processing error: {e}",
-                'traceback': traceback.format_exc()
-            }
+            return _error_response(f"Command processing error: {e}")
     
     def handle_ping(self):
         """Handle ping command"""
-        return {
-            'type': Response.SUCCESS.value,
-            'message': 'pong',
-            'server_info': {
-                'python_version': sys.version,
-                'platform': sys.platform,
-                'devices': len(self.device_handlers),
-                'is_streaming': self.is_streaming,
-            }
-        }
+        return _PING_TEMPLATE % (len(self.device_handlers), _JSON_BOOL[bool(self.is_streaming)])
     
     def handle_discover_devices(self):
         '''
         For all available backends, this will try to discover devices
         ''' 
         
-        print("🔍 Starting device discovery...")
+        logger.debug("🔍 Starting device discovery...")
         self.discovered_devices = [] 
         try: 
-            self.discovered_devices = discover_devices()
+            self.discovered_devices = self._discover()
         except Exception as e: 
             return {
-                    'type': Response.ERROR.value,
+                    'type': ERROR,
                     'message': f'Device discovery failed: {e}',
                     'step': 'discovery'
                 }    
         
         return {
-                'type': Response.SUCCESS.value,
+                'type': SUCCESS,
                 'message': f'Found {len(self.discovered_devices)} devices',
                 'devices': self.discovered_devices,
                 'step': 'discovery'
@@ -266,108 +629,117 @@ class Server:
     def handle_connect_device(self):
         """Handle device connection"""
         try:
-            for device in self.device_handlers.values(): 
+            for device in self._handlers: 
                 device.connect()
             
-            print("✓ Devices connected")
+            logger.debug("✓ Devices connected")
             
-            return {
-                'type': Response.SUCCESS.value,
-                'message': 'Connect successful'
-            }
+            return _CONNECT_RESPONSE
             
         except Exception as e:
-            return {
-                'type': Response.ERROR.value,
-                'message': f'Connect error: {e}'
-            }
+            return _error_response(f'Connect error: {e}')
     
     def handle_disconnect_device(self):
         """ Tell all devices to disconnect """
         try:
-            for device in self.device_handlers.values(): 
+            for device in self._handlers: 
                 device.disconnect()
             
-            print("✓ Devices disconnected")
+            logger.debug("✓ Devices disconnected")
             
-            return {
-                'type': Response.SUCCESS.value,
-                'message': 'Disconnect successful'
-            }
+            return _DISCONNECT_RESPONSE
             
         except Exception as e:
-            return {
-                'type': Response.ERROR.value,
-                'message': f'Disconnect error: {e}'
-            }
+            return _error_response(f'Disconnect error: {e}')
+    
+    def _discover(self): 
+        """Run discovery in a long-lived worker process, so a crash in a device driver spares the server"""
+        if self._discovery_pool is None:
+            self._discovery_pool = ProcessPoolExecutor(max_workers=1, mp_context=_mp)
+        
+        try:
+            return self._discovery_pool.submit(discover_devices).result(timeout=DEVICE_REQUEST_TIMEOUT)
+        except BrokenProcessPool:
+            # Replaced on the next discovery
+            self._discovery_pool.shutdown(wait=False)
+            self._discovery_pool = None
+            raise RuntimeError("discovery worker exited unexpectedly")
     
     def handle_get_status(self):
         """Get current server status"""
-        return {
-            'type': Response.SUCCESS.value,
-            'message': 'Status retrieved',
-            'status': {
-                'devices': self.discovered_devices,
-                'is_streaming': self.is_streaming,
-            }
-        }
+        # Discovery replaces the device list rather than mutating it, so re-encode only once either changes
+        devices, is_streaming, encoded = self._status_cache
+        if devices is not self.discovered_devices or is_streaming != self.is_streaming:
+            encoded = encode({
+                'type': SUCCESS,
+                'message': 'Status retrieved',
+                'status': {
+                    'devices': self.discovered_devices,
+                    'is_streaming': self.is_streaming,
+                }
+            })
+            self._status_cache = (self.discovered_devices, self.is_streaming, encoded)
+        return encoded
     
     def handle_init_device(self, params): 
         device_id = params['id']
-        config = Configuration.from_json(params['config'])
-        exp_config = Configuration.from_json(params['exp_config'])
+        config = _load_config(params['config'])
+        exp_config = _load_config(params['exp_config'])
         save = params.get('save', False)
 
         # Create device handler objects with provided config, regardless of whether a prior config existed
         try:
-            self.device_handlers[device_id] = DeviceHandler(config=config, data_queue=self.data_queue, exp_config=exp_config, save=save)
-            print("✓ Device inited")
+            previous = self.device_handlers.get(device_id)
+            if previous is not None:
+                previous.shutdown()
             
-            return {
-                'type': Response.SUCCESS.value,
-                'message': 'Device inited successfully'
-            }
+            handler = DeviceHandler(config=config, data_queue=self.data_queue, exp_config=exp_config, save=save)
+            handler.start()
+            self.device_handlers[device_id] = handler
+            self._handlers = tuple(self.device_handlers.values())
+            logger.debug("✓ Device inited")
+            
+            return _INIT_RESPONSE
             
         except Exception as e:
-            return {
-                'type': Response.ERROR.value,
-                'message': f'Initialization failed: {e}',
-                'traceback': traceback.format_exc()
-            }
+            return _error_response(f'Initialization failed: {e}')
     
     def handle_update_device_config(self, params):
         device_id = params['id']
         
-        if device_id not in self.device_handlers.keys(): 
-            return {
-                'type': Response.ERROR.value,
-                'message': f'Device not initialized'
-            }
+        if device_id not in self.device_handlers: 
+            return _NOT_INITIALIZED_RESPONSE
         
         device_handler = self.device_handlers[device_id]
         
-        # Updated config occurs here 
-        for key, value in params['config']: 
-            device_handler.update_config(key, value) 
+        # Updated config occurs here, all keys in one request to the handler
+        try:
+            device_handler.update_config_bulk(list(params['config'].items()))
+        except Exception as e:
+            return _error_response(f'Config update failed: {e}')
+        
+        return _CONFIG_UPDATED_RESPONSE
         
     def handle_update_device_param(self, params): 
         device_id = params['id']
         
-        if device_id not in self.device_handlers.keys(): 
-            return {
-                'type': Response.ERROR.value,
-                'message': f'Device not initialized'
-            }
+        if device_id not in self.device_handlers: 
+            return _NOT_INITIALIZED_RESPONSE
         
         device_handler = self.device_handlers[device_id]
         
-        # Updated config occurs here 
-        for key, value in params['config']: 
-            device_handler.update_param(key, value) 
+        # Updated params occur here, all keys in one request to the handler
+        try:
+            device_handler.update_params_bulk(list(params['config'].items()))
+        except Exception as e:
+            return _error_response(f'Param update failed: {e}')
+        
+        return _PARAMS_UPDATED_RESPONSE
     
     def handle_shutdown(self):
         """Handle server shutdown"""
-        print("🛑 Shutdown requested")
+        logger.info("🛑 Shutdown requested")
+        _parse_config.cache_clear()
         
         # Disconnect device first
         self.handle_disconnect_device()
@@ -379,65 +751,115 @@ class Server:
         
         Thread(target=stop_server, daemon=True).start()
         
-        return {
-            'type': Response.SUCCESS.value,
-            'message': 'Server shutting down'
-        }
+        return _SHUTDOWN_RESPONSE
         
     def handle_start_streaming(self): 
         """Start real-time data streaming"""
         if len(self.device_handlers) == 0: 
-            return {
-                'type': Response.ERROR.value,
-                'message': 'No device connected'
-            }
+            return _NO_DEVICE_RESPONSE
         
         try:
-            print("🚀 Starting data streaming...")
+            logger.debug("🚀 Starting data streaming...")
             
             # Start your existing receive/transmit workers
-            for handler in self.device_handlers.values():
-                handler.start()
+            for handler in self._handlers:
+                handler.start_streaming()
             
             self.is_streaming = True 
+            # Reuse the forwarding thread if it has not yet seen a previous stop
+            if self._data_thread is None or not self._data_thread.is_alive():
+                self._data_thread = Thread(target=self.handle_data, daemon=True)
+                self._data_thread.start()
             
-            print("✓ Data streaming started")
-            return {
-                'type': Response.SUCCESS.value,
-                'message': 'Data streaming started'
-            }
+            logger.debug("✓ Data streaming started")
+            return _START_STREAMING_RESPONSE
             
         except Exception as e:
             self.is_streaming = False 
-            return {
-                'type': Response.ERROR.value,
-                'message': f'Failed to start streaming: {e}',
-                'traceback': traceback.format_exc()
-            }
+            return _error_response(f'Failed to start streaming: {e}')
     
     def handle_stop_streaming(self): 
         """Stop data streaming"""
         try:
             if self.is_streaming: 
-                print("🛑 Stopping data streaming...")
-                for handler in self.device_handlers.values(): 
-                    handler.stop() 
+                logger.debug("🛑 Stopping data streaming...")
+                for handler in self._handlers: 
+                    handler.stop_streaming() 
                     
             self.is_streaming = False 
-            return {
-                'type': Response.SUCCESS.value,
-                'message': 'Data streaming stopped'
-            }
+            return _STOP_STREAMING_RESPONSE
         except Exception as e:
-            return {
-                'type': Response.ERROR.value,
-                'message': f'Failed to stop streaming: {e}'
-            }
+            return _error_response(f'Failed to stop streaming: {e}')
     
     def handle_data(self): 
         # Sends data received from device handlers to clients
         while self.running and self.is_streaming: 
-            pass
+            try:
+                batch = [self.data_queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            
+            # Take whatever else is already queued, so it all goes out together
+            try:
+                while len(batch) < DATA_BATCH_SIZE:
+                    batch.append(self.data_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            try:
+                # Display messages carry (samples, source)
+                self._send_data_to_clients([message.value[0] for message in batch])
+            except Exception as e:
+                logger.warning(f"Error sending data to clients: {e}")
+    
+    def _send_data_to_clients(self, batch): 
+        """Encode each array in batch as a frame once and send them all to every data client"""
+        clients = self.data_clients
+        if not clients:
+            return
+        
+        buffers = []
+        for data in batch:
+            buffers.extend(self._serialize_data(data))
+        
+        disconnected_clients = []
+        for client in clients:
+            try:
+                send_buffers(client, *buffers)
+            except OSError:
+                disconnected_clients.append(client)
+        
+        # Drop failed clients, the selector loop closes them once shut down
+        if disconnected_clients:
+            with self.data_lock:
+                self.data_clients = tuple(c for c in self.data_clients if c not in disconnected_clients)
+            for client in disconnected_clients:
+                try:
+                    client.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+    
+    def _serialize_data(self, data): 
+        """Serialize an array as a data frame, see protocol.py for the format
+        
+        Returns the length prefix and frame header as bytes, along with a byte view over 
+        the array buffer so that it is sent without being copied.
+        """
+        data = np.ascontiguousarray(data)
+        if data.ndim > 2: 
+            raise ValueError(f'Only 1D and 2D arrays can be streamed, got shape {data.shape}')
+        
+        payload = memoryview(data.reshape(-1).view(np.uint8))
+        header = FRAME_LENGTH.pack(FRAME_HEADER.size + payload.nbytes) + FRAME_HEADER.pack(
+            DTYPE_CODES[data.dtype.name], 
+            data.ndim, 
+            data.shape[0], 
+            data.shape[1] if data.ndim == 2 else 0, 
+            time.time(), 
+            payload.nbytes
+        )
+        
+        return header, payload
     
 
 """ Device Handler
@@ -450,8 +872,12 @@ along with storing the read data in a data dump in storage
 
 """
 
-class DeviceHandler(mp.Process):
+# Subclasses the context's Process so handlers start through the forkserver (or spawn) too, 
+# rather than being forked from a server that already runs the I/O and log threads
+class DeviceHandler(_mp.Process):
     def __init__(self, config: Configuration, exp_config: Configuration, data_queue: mp.Queue, save):
+        super().__init__(daemon=True)
+        
         # Device configuration
         self.config = config 
         self.exp_config = exp_config
@@ -461,13 +887,94 @@ class DeviceHandler(mp.Process):
         self.device = None 
         self.data_queue = data_queue
         
+        # Requests from the server and their outcomes, see run(). Each carries an ID so that 
+        # a late reply to a request that timed out is not taken for the next one's
+        self._cmd_q = _mp.Queue()
+        self._resp_q = _mp.Queue()
+        self._request_id = 0
+        
         # Device status 
         self.is_connected = False 
         self.is_streaming = False 
         
         self.running = False 
+    
+    def run(self): 
+        # Runs in the handler process, carrying out requests until told to exit
+        self.running = True
+        while self.running:
+            request_id, name, args = self._cmd_q.get()
+            if name is None:
+                break
+            
+            try:
+                getattr(self, f'_{name}')(*args)
+            except Exception as e:
+                self._resp_q.put((request_id, False, str(e)))
+            else:
+                self._resp_q.put((request_id, True, None))
+    
+    def _request(self, name, *args): 
+        """Have the handler process run a request and wait for its outcome"""
+        if not self.is_alive():
+            raise RuntimeError(f'{self.device_name} handler process is not running')
         
+        self._request_id += 1
+        request_id = self._request_id
+        self._cmd_q.put((request_id, name, args))
+        # Wait in short steps, so that a handler process that dies is noticed without waiting out the timeout
+        deadline = time.monotonic() + DEVICE_REQUEST_TIMEOUT
+        while True:
+            try:
+                reply_id, ok, error = self._resp_q.get(timeout=0.5)
+                if reply_id == request_id:
+                    break
+                # Late reply to an earlier request that timed out
+            except queue.Empty:
+                if not self.is_alive():
+                    raise RuntimeError(f'{self.device_name} handler process exited during {name}')
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'{self.device_name} did not respond to {name}')
+        if not ok:
+            raise RuntimeError(error)
+    
+    def shutdown(self): 
+        """Ask the handler process to exit, terminating it if it does not"""
+        if self.is_alive():
+            self._cmd_q.put((None, None, ()))
+            self.join(timeout=DEVICE_REQUEST_TIMEOUT)
+        
+        # Stuck in a device call, e.g. a driver that never returns
+        if self.is_alive():
+            self.terminate()
+            self.join()
+    
     def connect(self):
+        self._request('connect')
+    
+    def start_streaming(self):
+        self._request('start_streaming')
+    
+    def stop_streaming(self):
+        self._request('stop_streaming')
+        
+    def disconnect(self):
+        self._request('disconnect')
+        
+    def update_config(self, param, value): 
+        self._request('update_config', param, value)
+    
+    def update_param(self, param, value): 
+        self._request('update_param', param, value)
+    
+    def update_config_bulk(self, pairs): 
+        self._request('update_config_bulk', pairs)
+    
+    def update_params_bulk(self, pairs): 
+        self._request('update_params_bulk', pairs)
+    
+    # Handler process side
+    def _connect(self):
         # Create device object 
         self.device = get_device_object(
             device_name = self.device_name, 
@@ -480,21 +987,30 @@ class DeviceHandler(mp.Process):
         
         self.device.connect()
     
-    def start(self):
+    def _start_streaming(self):
         self.device.run()
     
-    def stop(self):
+    def _stop_streaming(self):
         self.device.stop()
         
-    def disconnect(self):
+    def _disconnect(self):
         self.device.disconnect()
         
-    def update_config(self, param, value): 
+    def _update_config(self, param, value): 
         self.device.update_config(param, value)    
     
-    def update_param(self, param, value): 
+    def _update_param(self, param, value): 
         self.device.update_param(param, value)
     
+    # Requests are carried out one at a time, so a bulk update is applied as a unit
+    def _update_config_bulk(self, pairs): 
+        for param, value in pairs:
+            self.device.update_config(param, value)
+    
+    def _update_params_bulk(self, pairs): 
+        for param, value in pairs:
+            self.device.update_param(param, value)
+
 if __name__ == "__main__":
     print("=" * 50)
     print(f"BioView Device Server, Version: {BIOVIEW_VERSION}")
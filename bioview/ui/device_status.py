@@ -1,9 +1,18 @@
-from PyQt6.QtCore import QEvent
-from PyQt6.QtGui import QColor, QPainter, QPen
+from PyQt6.QtCore import QEvent, QRectF
+from PyQt6.QtGui import QBrush, QColor, QPainter, QPen
 from PyQt6.QtWidgets import QHBoxLayout, QLabel, QWidget
 
 from bioview.datatypes import ConnectionStatus
 
+# LED fill for each state, built once
+LED_BRUSHES = {status: QBrush(status.value[1]) for status in ConnectionStatus}
+
+# Server label style for both states, switched through the "connected" property
+SERVER_STATUS_STYLE = (
+    'QLabel[connected="true"] { color: green; font-weight: bold; } '
+    'QLabel[connected="false"] { color: red; font-weight: bold; }'
+)
+
 
 class LEDIndicator(QWidget):
     """Indicate device status using the following codes -
@@ -18,26 +27,27 @@ class LEDIndicator(QWidget):
         self.size = size
         self.setFixedSize(size, size)
 
-        self.update_state(state)
+        # Outline and circle never change, so build them once rather than on every paint
+        margin = 1
+        self.pen = QPen(QColor(50, 50, 50), 1)
+        self.ellipse = QRectF(margin, margin, size - 2 * margin, size - 2 * margin)
 
     def update_state(self, state):
+        # Only actual transitions need a paint
+        if state is self.state:
+            return
         self.state = state
-        self.repaint()
+        # Schedule rather than force a paint so Qt can merge back-to-back changes
+        self.update()
 
     def paintEvent(self, event):
         # Draw the LED circle with appropriate color
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        color = self.state.value[1]
-
-        painter.setBrush(color)
-        painter.setPen(QPen(QColor(50, 50, 50), 1))
-
-        margin = 1
-        painter.drawEllipse(
-            margin, margin, self.size - 2 * margin, self.size - 2 * margin
-        )
+        painter.setBrush(LED_BRUSHES[self.state])
+        painter.setPen(self.pen)
+        painter.drawEllipse(self.ellipse)
 
 
 class DeviceStatusWidget(QWidget):
@@ -61,6 +71,8 @@ class DeviceStatusWidget(QWidget):
         self.setLayout(layout)
 
     def update_state(self, new_state):
+        if new_state is self.device_state:
+            return
         self.device_state = new_state
         self.indicator.update_state(new_state)
 
@@ -68,7 +80,7 @@ class DeviceStatusWidget(QWidget):
 class DeviceStatusPanel(QWidget):
     def __init__(self, devices):
         super().__init__()
-        self.devices = devices.copy()
+        self.devices = {}  # Device name -> state
         self.device_widgets = {}
 
         # Create horizontal layout for all devices
@@ -77,13 +89,15 @@ class DeviceStatusPanel(QWidget):
         self.layout.setSpacing(15)
 
         # Add server status 
+        self.server_connected = False
         self.server_status = QLabel("Server: Disconnected")
-        self.server_status.setStyleSheet("color: red; font-weight: bold;")
+        self.server_status.setProperty("connected", "false")
+        self.server_status.setStyleSheet(SERVER_STATUS_STYLE)
         self.layout.addWidget(self.server_status)
         self.layout.addWidget(QLabel("|"))
         
         # Add device widgets
-        for device_name, device_map in self.devices.items():
+        for device_name, device_map in devices.items():
             device_state = device_map["state"]
             self.add_device(device_name, device_state)
 
@@ -91,17 +105,25 @@ class DeviceStatusPanel(QWidget):
 
     def update_server_status(self, connected):
         """Update server status"""
-        if connected:
-            self.server_status.setText("Server: Connected")
-            self.server_status.setStyleSheet("color: green; font-weight: bold;")
-        else:
-            self.server_status.setText("Server: Disconnected")
-            self.server_status.setStyleSheet("color: red; font-weight: bold;")
+        connected = bool(connected)
+        if connected == self.server_connected:
+            return
+        self.server_connected = connected
+
+        self.server_status.setText("Server: Connected" if connected else "Server: Disconnected")
+        # Stylesheet is already parsed, re-polishing picks the rule for the new property value
+        self.server_status.setProperty("connected", "true" if connected else "false")
+        style = self.server_status.style()
+        style.unpolish(self.server_status)
+        style.polish(self.server_status)
     
     # Handle theme changes
     def _update_icons(self):
-        for device_name, device_state in self.devices.items():
-            self.device_widgets[device_name].update_state(device_state)
+        # States are unchanged, so only ask for a repaint, merged into one pass
+        self.setUpdatesEnabled(False)
+        for device_widget in self.device_widgets.values():
+            device_widget.indicator.update()
+        self.setUpdatesEnabled(True)
 
     def event(self, event):
         if event.type() == QEvent.Type.ApplicationPaletteChange:
@@ -115,7 +137,7 @@ class DeviceStatusPanel(QWidget):
         self.devices[device_name] = device_state
 
     def update_device_state(self, device_name, new_state):
-        if device_name in self.device_widgets.keys():
+        if device_name in self.device_widgets.keys() and self.devices[device_name] is not new_state:
             self.device_widgets[device_name].update_state(new_state)
             self.devices[device_name] = new_state
 
@@ -22,6 +22,10 @@ from bioview.datatypes import (
 )
 from bioview.utils import get_qcolor
 
+CHECKED = Qt.CheckState.Checked
+UNCHECKED = Qt.CheckState.Unchecked
+SOURCE_ROLE = Qt.ItemDataRole.UserRole  # Item data role holding the DataSource
+
 
 class CheckableListView(QListView):
     def __init__(self, combo_box):
@@ -46,84 +50,89 @@ class CheckableComboBox(QComboBox):
         super().__init__(parent)
         self._view = CheckableListView(self)
         self.setView(self._view)
-        self.setModel(QStandardItemModel(self))
-        self.view().viewport().installEventFilter(self)
+        # Model and line edit are kept rather than fetched through the bindings each time
+        self.item_model = QStandardItemModel(self)
+        self.setModel(self.item_model)
+        self._view.viewport().installEventFilter(self)
         self.setEditable(True)
-        self.lineEdit().setReadOnly(True)
-        self.lineEdit().setPlaceholderText("Select options...")
+        self.line_edit = self.lineEdit()
+        self.line_edit.setReadOnly(True)
+        self.line_edit.setPlaceholderText("Select options...")
         self.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
         self.clearEditText()
 
-    def addItem(self, source: DataSource, checked=False):
-        """Add a DataSource item to the combo box"""
-        text = source.label
-        item = QStandardItem(text)
+        # Item for each source, so sources are found without scanning the model
+        self.items = {}
+        # Label of each checked source, in the order they were checked
+        self.checked = {}
+
+    def _make_item(self, source: DataSource, checked=False):
+        item = QStandardItem(source.label)
         item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable)
         item.setData(
-            Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked,
+            CHECKED if checked else UNCHECKED,
             Qt.ItemDataRole.CheckStateRole,
         )
         # Store the DataSource object in the item's UserRole
-        item.setData(source, Qt.ItemDataRole.UserRole)
-        self.model().appendRow(item)
+        item.setData(source, SOURCE_ROLE)
+        self.items[source] = item
+        return item
+
+    def addItem(self, source: DataSource, checked=False):
+        """Add a DataSource item to the combo box"""
+        self.item_model.appendRow(self._make_item(source, checked))
         if checked:
+            self.checked[source] = source.label
             self.selectionChanged.emit("add", source)
 
+    def addItems(self, sources):
+        """Add unchecked DataSource items to the combo box in one model insert"""
+        items = [self._make_item(source) for source in sources]
+        if items:
+            self.item_model.invisibleRootItem().appendRows(items)
+
     def toggle_item(self, item: QStandardItem):
         """Toggle the check state of an item and emit the appropriate signal"""
-        source = item.data(Qt.ItemDataRole.UserRole)
-        if item.checkState() == Qt.CheckState.Checked:
-            item.setCheckState(Qt.CheckState.Unchecked)
+        source = item.data(SOURCE_ROLE)
+        if item.checkState() == CHECKED:
+            item.setCheckState(UNCHECKED)
+            self.checked.pop(source, None)
             self.selectionChanged.emit("remove", source)
         else:
-            item.setCheckState(Qt.CheckState.Checked)
+            item.setCheckState(CHECKED)
+            self.checked[source] = item.text()
             self.selectionChanged.emit("add", source)
         self.update_line_text()
 
     def select_source(self, source: DataSource):
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            item_source = item.data(Qt.ItemDataRole.UserRole)
-            if item_source == source and item.checkState() != Qt.CheckState.Checked:
-                item.setCheckState(Qt.CheckState.Checked)
-                self.update_line_text()
-                break
+        item = self.items.get(source)
+        if item is not None and item.checkState() != CHECKED:
+            item.setCheckState(CHECKED)
+            self.checked[source] = item.text()
+            self.update_line_text()
 
     def unselect_source(self, source: DataSource):
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            item_source = item.data(Qt.ItemDataRole.UserRole)
-            if item_source == source and item.checkState() != Qt.CheckState.Unchecked:
-                item.setCheckState(Qt.CheckState.Unchecked)
-                self.update_line_text()
-                break
+        item = self.items.get(source)
+        if item is not None and item.checkState() != UNCHECKED:
+            item.setCheckState(UNCHECKED)
+            self.checked.pop(source, None)
+            self.update_line_text()
 
     def checkedItems(self):
         """Return list of checked DataSource objects"""
-        checked_sources = []
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                source = item.data(Qt.ItemDataRole.UserRole)
-                checked_sources.append(source)
-        return checked_sources
+        return list(self.checked)
 
     def checkedItemTexts(self):
         """Return list of checked source names"""
-        return [
-            self.model().item(i).text()
-            for i in range(self.model().rowCount())
-            if self.model().item(i).checkState() == Qt.CheckState.Checked
-        ]
+        return list(self.checked.values())
 
     def update_line_text(self):
         """Update the line edit text with checked source names"""
-        checked_texts = self.checkedItemTexts()
-        self.lineEdit().setText(", ".join(checked_texts) if checked_texts else "")
+        self.line_edit.setText(", ".join(self.checked.values()))
 
     def eventFilter(self, source, event):
         if event.type() == QEvent.Type.MouseButtonPress:
-            index = self.view().indexAt(event.pos())
+            index = self._view.indexAt(event.pos())
             if not index.isValid():
                 self.hidePopup()
         return super().eventFilter(source, event)
@@ -143,6 +152,16 @@ class ExperimentSettingsPanel(QGroupBox):
         self.param_inputs = {}
         self.init_ui()
 
+        # Handlers by action, unknown actions are ignored
+        self.channel_requests = {
+            "add": self.addChannelRequested.emit,
+            "remove": self.removeChannelRequested.emit,
+        }
+        self.source_updates = {
+            "add": self.plot_source.select_source,
+            "remove": self.plot_source.unselect_source,
+        }
+
     def init_ui(self):
         layout = QGridLayout()
         row = 0
@@ -220,8 +239,7 @@ class ExperimentSettingsPanel(QGroupBox):
         layout.addWidget(QLabel("Plot Sources"), row, 0)
         self.plot_source = CheckableComboBox()
         # Assuming available_channels contains DataSource objects
-        for source in self.config.available_channels:
-            self.plot_source.addItem(source)
+        self.plot_source.addItems(self.config.available_channels)
         self.plot_source.selectionChanged.connect(self.request_channel_update)
 
         layout.addWidget(self.plot_source, row, 1)
@@ -245,21 +263,15 @@ class ExperimentSettingsPanel(QGroupBox):
 
     def request_channel_update(self, action: str, source: DataSource):
         """Handle channel selection changes"""
-        if action == "remove":
-            self.removeChannelRequested.emit(source)
-        elif action == "add":
-            self.addChannelRequested.emit(source)
-        else:
-            return
+        handler = self.channel_requests.get(action)
+        if handler is not None:
+            handler(source)
 
     def update_source(self, action: str, source: DataSource):
         """Update channel selection state"""
-        if action == "add":
-            self.plot_source.select_source(source)
-        elif action == "remove":
-            self.plot_source.unselect_source(source)
-        else:
-            return None
+        handler = self.source_updates.get(action)
+        if handler is not None:
+            handler(source)
 
     def openFolderDialog(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Folder")
@@ -1,6 +1,6 @@
 import logging
 from PyQt6.QtWidgets import QGroupBox, QVBoxLayout, QPlainTextEdit
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 
 
 # Make a thread safe logging handler
@@ -32,6 +32,7 @@ class LogDisplayPanel(QGroupBox):
         layout = QVBoxLayout()
         self.log_text_box = QPlainTextEdit(self)
         self.log_text_box.setReadOnly(True)
+        self.log_text_box.setMaximumBlockCount(5000)  # Oldest lines are evicted
 
         layout.addWidget(self.log_text_box)
         self.setLayout(layout)
@@ -45,6 +46,7 @@ class LogDisplayPanel(QGroupBox):
         self.log_handler.setFormatter(formatter)
         self.logger.addHandler(self.log_handler)
 
+    @pyqtSlot(str, str)
     def log_message(self, level, msg):
         log_method = getattr(self.logger, level, None)
         if log_method is not None:
@@ -1,9 +1,8 @@
-import queue
 from collections import deque
 
 import numpy as np
 import pyqtgraph as pg
-from PyQt6.QtCore import QEvent, QTimer, pyqtSignal
+from PyQt6.QtCore import QEvent, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QGuiApplication
 from PyQt6.QtWidgets import QGridLayout, QWidget
 
@@ -43,7 +42,6 @@ class PlotManager:
 
         # Data handling
         self.data_src = data_src
-        self.data_queue = queue.Queue()
 
         # Initialize after setting up basic properties
         self._init_plot()
@@ -59,6 +57,10 @@ class PlotManager:
         # Initialize buffer with zeros - deque with fixed maxlen for sliding window
         self.buffer = deque([0.0] * self.num_points, maxlen=self.num_points)
 
+        # Points waiting to be plotted, at most 25% of the display buffer.
+        # If we fall behind, the oldest points drop off to stay real-time
+        self.data_queue = deque(maxlen=max(self.num_points // 4, 1))
+
         # Create time vector that will be reused
         self.time_vector = np.linspace(
             0, self.display_duration, self.num_points, endpoint=False
@@ -75,71 +77,24 @@ class PlotManager:
         self.data_src = data_src
         self._init_plot()
 
-        # Flush queue
-        while not self.data_queue.empty():
-            try:
-                self.data_queue.get_nowait()
-            except queue.Empty:
-                break
-
     def add_data(self, data):
+        # Data and plotting both run on the GUI thread, so points go straight into the deque
         if isinstance(data, (list, np.ndarray)):
-            # If it's an array, add each point individually to maintain proper sliding
-            for point in np.atleast_1d(data):
-                self._add_single_point(float(point))
+            self.data_queue.extend(np.asarray(data, dtype=float).ravel().tolist())
         else:
-            self._add_single_point(float(data))
-
-    def _add_single_point(self, point):
-        # Keep queue size reasonable - if it gets too big, we're falling behind
-        max_queue_size = (
-            self.num_points // 4
-        )  # Allow max 25% of display buffer in queue
-
-        if self.data_queue.qsize() > max_queue_size:
-            # We're falling behind - drop old data to stay real-time
-            try:
-                # Drop some old points to make room
-                drop_count = max_queue_size // 4
-                for _ in range(drop_count):
-                    self.data_queue.get_nowait()
-            except queue.Empty:
-                pass
-
-        self.data_queue.put(point)
+            self.data_queue.append(float(data))
 
     def update_plot(self):
-        # Calculate how many points we should process to stay real-time
-        queue_size = self.data_queue.qsize()
-
-        if queue_size == 0:
+        # Only update the plot if we have new data
+        if not self.data_queue:
             return
 
-        skip_ratio = 1
-        updates_made = False
-        points_processed = 0
-        skip_counter = 0
-
-        while not self.data_queue.empty() and points_processed < queue_size:
-            try:
-                new_point = self.data_queue.get_nowait()
+        # Add to deque - this automatically removes oldest points due to maxlen
+        self.buffer.extend(self.data_queue)
+        self.data_queue.clear()
 
-                # Skip points if we're behind (temporal downsampling)
-                skip_counter += 1
-                if skip_counter >= skip_ratio:
-                    skip_counter = 0
-                    # Add to deque - this automatically removes oldest point due to maxlen
-                    self.buffer.append(new_point)
-                    updates_made = True
-
-                points_processed += 1
-            except queue.Empty:
-                break
-
-        # Only update the plot if we have new data
-        if updates_made:
-            # Convert deque to list for plotting - this is the sliding window effect
-            self.plot_item.setData(self.time_vector, list(self.buffer))
+        # Read the deque straight into an array for plotting - this is the sliding window effect
+        self.plot_item.setData(self.time_vector, np.fromiter(self.buffer, dtype=float, count=self.num_points))
 
     def update_display_duration(self, duration):
         self.display_duration = duration
@@ -279,18 +234,15 @@ class PlotGrid(QWidget):
 
         return True
 
+    @pyqtSlot(np.ndarray, DataSource)
     def add_new_data(self, data, source):
-        for channel_idx in range(np.shape(data)[0]):
-            if channel_idx >= len(self.config.display_sources):
-                break
-
-            channel_key = self.config.display_sources[channel_idx]
-            if channel_key not in self.selected_channels.keys():
-                continue
+        # Data arrives one source at a time, so its plot is a single lookup
+        channel = self.selected_channels.get(source)
+        if channel is None:
+            return
 
-            plot_obj = self.selected_channels[channel_key]["plot"]
-            # Pass the data for this channel (could be multiple samples)
-            plot_obj.add_data(data[channel_idx, :])
+        # Pass the data for this channel (could be multiple samples)
+        channel["plot"].add_data(data)
 
     def update_plots(self):
         for val in self.selected_channels.values():
@@ -303,7 +255,7 @@ class PlotGrid(QWidget):
 
         for channel_data in self.selected_channels.values():
             plot_obj = channel_data["plot"]
-            queue_size = plot_obj.data_queue.qsize()
+            queue_size = len(plot_obj.data_queue)
             total_queued += queue_size
             max_queue = max(max_queue, queue_size)
 
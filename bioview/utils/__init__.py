@@ -7,7 +7,7 @@ from .caches import (
     update_mpdev_path,
 )
 from .filter import get_filter, apply_filter
-from .ipc import emit_signal
+from .ipc import emit_signal, SharedArrayRing, SharedArrayReader
 from .storage import get_unique_path, init_save_file, update_save_file
 from .theme import get_color_by_idx, get_color_tuple, get_qcolor
 from .usrp import get_channel_map, setup_pps, setup_ref, check_channels
@@ -22,6 +22,8 @@ __all__ = [
     "get_filter",
     "apply_filter",
     "emit_signal",
+    "SharedArrayRing",
+    "SharedArrayReader",
     "get_unique_path",
     "init_save_file",
     "update_save_file",
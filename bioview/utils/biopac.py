@@ -5,13 +5,35 @@ from pathlib import Path
 from bioview.constants import BIOPAC_CONNECTION_CODES
 from .caches import get_mpdev_path, update_mpdev_path
 
+# Loaded DLL for each custom location, so the search only runs until it first succeeds
+_mpdev_dlls = {}
+
+# Result code for success, checked before any lookup since it is by far the most common
+_MPSUCCESS = next(code for code, name in BIOPAC_CONNECTION_CODES.items() if name == "MPSUCCESS")
+
+# BIOPAC installs to <Program Files>/BIOPAC Systems, Inc/<API version>/x64, so only a few levels are searched
+_MPDEV_PATTERNS = (
+    "BIOPAC*/*/x64/mpdev.dll",
+    "BIOPAC*/x64/mpdev.dll",
+    "BIOPAC*/*/*/x64/mpdev.dll",
+)
+
 
 def load_mpdev_dll(custom_loc: str = None):
+    dll = _mpdev_dlls.get(custom_loc)
+    if dll is None:
+        dll = _find_mpdev_dll(custom_loc)
+        if dll is not None:
+            _mpdev_dlls[custom_loc] = dll
+    return dll
+
+
+def _find_mpdev_dll(custom_loc: str = None):
     dll = None
     try:
         dll = ctypes.CDLL("mpdev.dll")
         print("mpdev.dll found!")
-        return
+        return dll
     except FileNotFoundError:
         print("mpdev.dll is not located in $PATH")
 
@@ -31,21 +53,32 @@ def load_mpdev_dll(custom_loc: str = None):
         return ctypes.CDLL(dll_path)
     else:
         print("Searching for mpdev.dll in OS folders")
-        sys_dir = Path(os.path.abspath(os.sep))
-        dll_locs = sys_dir.glob("Program Files*/BIOPAC*/**/x64/mpdev.dll")
-
-        for loc in dll_locs:
-            update_mpdev_path(loc)
-            dll = ctypes.CDLL(loc)
-            print("mpdev.dll found!")
-            return dll
+        for program_dir in _get_program_dirs():
+            for pattern in _MPDEV_PATTERNS:
+                for loc in program_dir.glob(pattern):
+                    update_mpdev_path(loc)
+                    dll = ctypes.CDLL(loc)
+                    print("mpdev.dll found!")
+                    return dll
 
     return None
 
 
+def _get_program_dirs():
+    # Program Files folders as Windows reports them, otherwise whatever matches at the root
+    program_dirs = []
+    for var in ("ProgramW6432", "PROGRAMFILES", "PROGRAMFILES(X86)"):
+        program_dir = os.environ.get(var)
+        if program_dir and Path(program_dir) not in program_dirs:
+            program_dirs.append(Path(program_dir))
+    if not program_dirs:
+        program_dirs = list(Path(os.path.abspath(os.sep)).glob("Program Files*"))
+    return program_dirs
+
+
 def wrap_result_code(result, stage=""):
-    result_code = BIOPAC_CONNECTION_CODES.get(result, "INVALID_CODE")
-    if result_code == "MPSUCCESS":
+    if result == _MPSUCCESS:
         return True
-    else:
-        raise Exception(f"{stage} Failure - {result_code}")
+
+    result_code = BIOPAC_CONNECTION_CODES.get(result, "INVALID_CODE")
+    raise Exception(f"{stage} Failure - {result_code}")
@@ -1,9 +1,87 @@
-def emit_signal(func, *args, **kwargs): 
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+def emit_signal(func, *args): 
+    # Callbacks are only ever given positional arguments, so no keyword packing per call
     if func is None: 
         return 
     
     try: 
-        func(*args, **kwargs)
+        func(*args)
     except Exception as e: 
-        print(f'Unable to emit signal: {repr(func)}')
-    
\ No newline at end of file
+        print(f'Unable to emit signal: {getattr(func, "__qualname__", func)} ({e})')
+    
+
+# Arrays sent for display are copied through a few fixed shared memory slots rather than pickled onto a queue
+SHARED_SLOT_BYTES = 1 << 20  # Larger arrays are sent as is
+SHARED_SLOTS = 8
+SHARED_HEADER_BYTES = 64  # Busy flag, padded so arrays stay aligned
+
+class SharedArrayRing:
+    '''
+    Producer side. Each slot starts with a busy flag that is set when an array is written 
+    and cleared by the reader once it has copied it out, so a slot is never overwritten unread.
+    '''
+    def __init__(self, slot_bytes=SHARED_SLOT_BYTES, num_slots=SHARED_SLOTS):
+        self.slot_bytes = slot_bytes
+        self.num_slots = num_slots
+        self.slots = []
+        self.next_slot = 0
+
+    def put(self, data):
+        # Returns a (name, shape, dtype) handle, or None if the array has to be sent as is
+        if not isinstance(data, np.ndarray) or data.nbytes > self.slot_bytes:
+            return None
+
+        if len(self.slots) < self.num_slots:
+            self.slots.append(shared_memory.SharedMemory(create=True, size=SHARED_HEADER_BYTES + self.slot_bytes))
+        shm = self.slots[self.next_slot]
+        if shm.buf[0]:
+            # Reader is behind
+            return None
+        self.next_slot = (self.next_slot + 1) % self.num_slots
+
+        np.ndarray(data.shape, data.dtype, buffer=shm.buf, offset=SHARED_HEADER_BYTES)[...] = data
+        shm.buf[0] = 1
+        return (shm.name, data.shape, data.dtype.str)
+
+    def close(self):
+        for shm in self.slots:
+            shm.close()
+            shm.unlink()
+        self.slots = []
+        self.next_slot = 0
+
+class SharedArrayReader:
+    '''
+    Consumer side, attaches to each slot once and copies arrays out of it.
+    '''
+    def __init__(self):
+        self.slots = {}
+
+    def read(self, handle):
+        name, shape, dtype = handle
+        shm = self.slots.get(name)
+        if shm is None:
+            shm = self.slots[name] = _attach_shared_memory(name)
+
+        data = np.ndarray(shape, dtype, buffer=shm.buf, offset=SHARED_HEADER_BYTES).copy()
+        shm.buf[0] = 0
+        return data
+
+    def close(self):
+        for shm in self.slots.values():
+            shm.close()
+        self.slots = {}
+
+def _attach_shared_memory(name):
+    # The producer owns the segment, so the reader must not have it unlinked on exit
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
@@ -1,5 +1,5 @@
 import subprocess
-import uhd
+from concurrent.futures import ThreadPoolExecutor
 
 def rename_uhd_device_eeprom(device_args, new_name, exe_path = None):
     """
@@ -38,6 +38,24 @@ def rename_uhd_device_eeprom(device_args, new_name, exe_path = None):
         print("usrp_burn_mb_eeprom not found. Make sure UHD is installed and in PATH.")
         return False
 
+def rename_uhd_devices(jobs, exe_path = None):
+    """
+    Rename several UHD devices at once, each burner runs in its own process concurrently
+    
+    Args:
+        jobs: List of (device_args, new_name) pairs
+    Returns:
+        List of success flags in the order of jobs
+    """
+    if not jobs: 
+        return []
+    
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        results = executor.map(
+            lambda job: rename_uhd_device_eeprom(job[0], job[1], exe_path=exe_path), jobs
+        )
+        return list(results)
+
 def verify_device_name(device_args):
     """Verify the device name by reading EEPROM"""
     cmd = [
@@ -57,6 +75,9 @@ def verify_device_name(device_args):
 
 # Usage example
 if __name__ == "__main__":
+    # Only the example needs uhd, so importing this module does not initialise it
+    import uhd
+    
     # For B210 device (you can also use serial number instead)
     addr = uhd.find('')[0]
     device_args = f"serial={addr['serial']}"  # or "serial=YOUR_SERIAL"
@@ -70,6 +91,6 @@ if __name__ == "__main__":
     # Verify the change
     print(f"\nTesting device discovery by name:")
         
-    # Test that the device can now be found by name
-    addr = uhd.find('')[0]
+    # Test that the device can now be found by name, looking only for its serial rather than sweeping for every device
+    addr = uhd.find(device_args)[0]
     print(addr['name'])
\ No newline at end of file
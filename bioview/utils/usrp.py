@@ -3,7 +3,6 @@ Ref: uhd examples
 """
 
 import time
-from datetime import datetime, timedelta
 
 import numpy as np
 
@@ -11,16 +10,14 @@ from bioview.constants import CLOCK_TIMEOUT
 from bioview.datatypes import DataSource
 
 
-def _check_pairing(r_idx, t_idx, rx_cumsum, tx_cumsum, pair_list):
-    fn = lambda x, y: (np.where(x - y < 0))[0][0]
-    rx_dev = fn(r_idx, rx_cumsum)
-    tx_dev = fn(t_idx, tx_cumsum)
-
-    return (
-        ((rx_dev, tx_dev) in pair_list)
-        or ((tx_dev, rx_dev) in pair_list)
-        or rx_dev == tx_dev
-    )
+def _pairing_mask(rx_devs, tx_devs, pair_list):
+    # A pair is allowed if both ends are on the same device or their devices are listed, in either order
+    size = 1 + max(rx_devs.max(initial=0), tx_devs.max(initial=0))
+    paired = np.eye(size, dtype=bool)
+    for rx_dev, tx_dev in pair_list:
+        if rx_dev < size and tx_dev < size:
+            paired[rx_dev, tx_dev] = paired[tx_dev, rx_dev] = True
+    return paired[rx_devs[:, None], tx_devs[None, :]]
 
 
 def get_channel_map(
@@ -47,38 +44,32 @@ def get_channel_map(
     num_txs = tx_cumsum[-1]
 
     if balance:
-        rx_enabled = [True if r % 2 == 0 else False for r in range(2 * n_devices)]
-        tx_enabled = [True if r % 2 == 0 else False for r in range(2 * n_devices)]
+        rx_enabled = np.arange(2 * n_devices) % 2 == 0
+        tx_enabled = np.arange(2 * n_devices) % 2 == 0
     else:
-        rx_enabled = [True for _ in range(num_rxs)]
-        tx_enabled = [True for _ in range(num_txs)]
-
-    rx_ctr = 1
-    ch_ctr = 0
-
-    for r_idx, rx_state in enumerate(rx_enabled):
-        if not rx_state:
-            continue
-
-        tx_ctr = 1
-        for t_idx, tx_state in enumerate(tx_enabled):
-            if not tx_state:
-                continue
-
-            if multi_pairs is None or _check_pairing(
-                r_idx, t_idx, rx_cumsum, tx_cumsum, multi_pairs
-            ):
-                source = DataSource(
-                    device=device, channel=ch_ctr, label=f"Tx{tx_ctr}Rx{rx_ctr}"
-                )
-                source.tx_idx = t_idx
-                source.rx_idx = r_idx
-                data_sources.append(source)
-                ch_ctr += 1
-
-            tx_ctr += 1
-
-        rx_ctr += 1
+        rx_enabled = np.ones(num_rxs, dtype=bool)
+        tx_enabled = np.ones(num_txs, dtype=bool)
+
+    # Enabled (Rx, Tx) pairs
+    mask = rx_enabled[:, None] & tx_enabled[None, :]
+    if multi_pairs is not None:
+        # Device each Rx/Tx index belongs to, the first device whose cumulative count is past it
+        rx_devs = np.searchsorted(rx_cumsum, np.arange(len(rx_enabled)), side="right")
+        tx_devs = np.searchsorted(tx_cumsum, np.arange(len(tx_enabled)), side="right")
+        mask &= _pairing_mask(rx_devs, tx_devs, multi_pairs)
+
+    # Labels count enabled channels only
+    rx_ctrs = np.cumsum(rx_enabled)
+    tx_ctrs = np.cumsum(tx_enabled)
+
+    # Row-major order, so channels are numbered by Rx then Tx
+    for ch_ctr, (r_idx, t_idx) in enumerate(np.argwhere(mask).tolist()):
+        source = DataSource(
+            device=device, channel=ch_ctr, label=f"Tx{tx_ctrs[t_idx]}Rx{rx_ctrs[r_idx]}"
+        )
+        source.tx_idx = t_idx
+        source.rx_idx = r_idx
+        data_sources.append(source)
 
     return data_sources
 
@@ -115,14 +106,18 @@ def setup_ref(usrp, ref, num_mboards):
     # Lock onto clock signals for all mboards
     if ref != "internal":
         print("Now confirming lock on clock signals...")
-        end_time = datetime.now() + timedelta(milliseconds=CLOCK_TIMEOUT)
+        end_time = time.monotonic() + CLOCK_TIMEOUT / 1000
+        get_sensor = usrp.get_mboard_sensor
         for i in range(num_mboards):
             if ref == "mimo" and i == 0:
                 continue
-            is_locked = usrp.get_mboard_sensor("ref_locked", i)
-            while (not is_locked) and (datetime.now() < end_time):
-                time.sleep(1e-3)
-                is_locked = usrp.get_mboard_sensor("ref_locked", i)
+            is_locked = get_sensor("ref_locked", i)
+            # Each sensor read is a round trip to the device, so back off between reads
+            delay = 1e-3
+            while (not is_locked) and (time.monotonic() < end_time):
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+                is_locked = get_sensor("ref_locked", i)
             if not is_locked:
                 print("Unable to confirm clock signal locked on board %d", i)
                 return False
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+from bioview.device.common.instructions import InstructionWorker  # noqa: E402
+
+DIRECT = QtCore.Qt.ConnectionType.DirectConnection
+TIMEOUT = 5  # Seconds
+
+
+class Config:
+    def __init__(self, **params):
+        self.params = params
+
+    def get_param(self, key, default=None):
+        return self.params.get(key, default)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def pool():
+    pool = QtCore.QThreadPool()
+    yield pool
+    pool.waitForDone()
+
+
+def test_run_is_invoked_on_pool(app, pool, tmp_path):
+    instruction_file = tmp_path / "instructions.txt"
+    instruction_file.write_text("Breathe in\nBreathe out\n")
+    worker = InstructionWorker(
+        Config(instruction_type="text", instruction_file=str(instruction_file))
+    )
+
+    shown = []
+    shown_event = threading.Event()
+
+    def on_toggle(visible):
+        shown.append((visible, threading.current_thread()))
+        shown_event.set()
+
+    worker.signals.toggleDialog.connect(on_toggle, DIRECT)
+    pool.start(worker)
+
+    assert shown_event.wait(TIMEOUT), "run() was never invoked"
+    worker.stop()
+    assert pool.waitForDone(TIMEOUT * 1000)
+
+    # Shown from the pooled thread by run(), hidden again once stopped
+    assert shown[0][0] is True
+    assert shown[0][1] is not threading.main_thread()
+    assert shown[-1][0] is False
+
+
+def test_run_without_handler_logs_warning(app, pool):
+    worker = InstructionWorker(Config(instruction_type="unknown"))
+
+    logged = []
+    worker.signals.logEvent.connect(lambda level, message: logged.append(level), DIRECT)
+    pool.start(worker)
+
+    assert pool.waitForDone(TIMEOUT * 1000)
+    assert logged == ["warning"]